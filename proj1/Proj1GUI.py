@@ -12,16 +12,16 @@ if PYQT_VER == 'PYQT5':
 	from PyQt5.QtWidgets import QApplication, QWidget
 	from PyQt5.QtGui import QIcon
 	from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout
-	from PyQt5.QtWidgets import QLabel, QPushButton, QLineEdit
+	from PyQt5.QtWidgets import QLabel, QPushButton, QLineEdit, QCheckBox
 elif PYQT_VER == 'PYQT4':
 	from PyQt4.QtGui import QApplication, QWidget
 	from PyQt4.QtGui import QHBoxLayout, QVBoxLayout
-	from PyQt4.QtGui import QIcon, QLabel, QPushButton, QLineEdit
+	from PyQt4.QtGui import QIcon, QLabel, QPushButton, QLineEdit, QCheckBox
 elif PYQT_VER == 'PYQT6':
 	from PyQt6.QtWidgets import QApplication, QWidget
 	from PyQt6.QtGui import QIcon
 	from PyQt6.QtWidgets import QHBoxLayout, QVBoxLayout
-	from PyQt6.QtWidgets import QLabel, QPushButton, QLineEdit
+	from PyQt6.QtWidgets import QLabel, QPushButton, QLineEdit, QCheckBox
 else:
 	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
 
@@ -49,6 +49,7 @@ class Proj1GUI( QWidget ):
 		self.input_n = QLineEdit('312')
 		self.input_k = QLineEdit('10')
 		self.test    = QPushButton('Test Primality')
+		self.deterministic = QCheckBox('Deterministic Miller-Rabin for N < 2^64')
 		self.outputF  = QLabel('<i>N is the number to test, K is how many random trials</i>')
 		self.outputF.setMinimumSize(500,0)
 		self.outputMR = QLabel('')
@@ -68,6 +69,7 @@ class Proj1GUI( QWidget ):
 
         # Test
 		h = QHBoxLayout()
+		h.addWidget( self.deterministic )
 		h.addStretch(1)
 		h.addWidget( self.test )
 		vbox.addLayout(h)
@@ -100,17 +102,23 @@ class Proj1GUI( QWidget ):
 
 			# This is the call to the pass-through function that gets your results, from
 			# both the Fermat and Miller-Rabin tests you will implement
-			fermat,mr = prime_test(n,k)
+			deterministic = self.deterministic.isChecked()
+			fermat,mr = prime_test(n,k,deterministic)
+			sieved = SIEVE.covers(n) # prime_test() answered from the sieve, so both verdicts are exact
 
 			# Output results from Fermat and compute the appropriate error bound, if necessary
-			if fermat == 'prime':
+			if fermat == 'prime' and sieved:
+				self.outputF.setText( '<i>Fermat Result:</i> {:d} <b>is prime</b> (proven)'.format(n) )
+			elif fermat == 'prime':
 				prob = fprobability(k)
 				self.outputF.setText( '<i>Fermat Result:</i> {:d} <b>is prime</b> with probability {:5.15f}'.format(n,prob) )
 			else: # Should be 'composite'
 				self.outputF.setText('<i>Fermat Result:</i> {:d} is <b>not prime</b>'.format(n))
 
 			# Output results from Miller-Rabin and compute the appropriate error bound, if necessary
-			if mr == 'prime':
+			if mr == 'prime' and (sieved or (deterministic and is_deterministic(n))):
+				self.outputMR.setText( '<i>MR Result:</i> {:d} <b>is prime</b> (proven)'.format(n) )
+			elif mr == 'prime':
 				prob = mprobability(k)
 				self.outputMR.setText( '<i>MR Result:</i> {:d} <b>is prime</b> with probability {:5.15f}'.format(n,prob) )
 			else: # Should be 'composite'
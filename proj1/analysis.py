@@ -0,0 +1,133 @@
+from fermat import mod_exp, mod_exp_recursive, Montgomery, miller_rabin, fermat, random_prime
+from prime_sieve import PrimeSieve
+import random
+import sys
+import time
+
+bit_sizes_to_test = [512, 1024, 2048, 4096, 8192]
+trials_per_size = 5
+
+# Bounds for the sieve-versus-probabilistic-test crossover benchmark
+sieve_limits_to_test = [10**3, 10**4, 10**5, 10**6, 10**7, 10**8]
+queries_per_limit = 1000
+k_for_crossover = 10
+
+# Prime generation throughput: bits -> how many primes to generate
+primes_to_generate = {1024: 10, 2048: 4, 4096: 2}
+
+# The recursive version needs one frame per exponent bit
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * max(bit_sizes_to_test)))
+
+
+def newOperands(bits):
+    """Generate an odd bits-bit modulus with a base and exponent of the same size."""
+    N = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+    x = random.randrange(2, N - 1)
+    y = random.getrandbits(bits) | (1 << (bits - 1))
+    return x, y, N
+
+
+def timeCall(fn, *args):
+    t1 = time.perf_counter()
+    result = fn(*args)
+    t2 = time.perf_counter()
+    return t2 - t1, result
+
+
+def benchmarkSieve(limit):
+    """
+    Returns (build, lookup, fermat, miller_rabin) times in seconds: the one-off cost of sieving
+    everything below limit, and the per-query cost of each way of answering a query near limit.
+    """
+    build_time, sieve = timeCall(PrimeSieve, limit)
+    build_time += timeCall(sieve.is_prime, limit - 1)[0]
+    queries = [random.randrange(limit // 2, limit) | 1 for _ in range(queries_per_limit)]
+
+    def lookups():
+        for N in queries:
+            sieve.is_prime(N)
+
+    def fermats():
+        for N in queries:
+            fermat(N, k_for_crossover)
+
+    def miller_rabins():
+        for N in queries:
+            miller_rabin(N, k_for_crossover)
+
+    return (build_time,
+            timeCall(lookups)[0] / queries_per_limit,
+            timeCall(fermats)[0] / queries_per_limit,
+            timeCall(miller_rabins)[0] / queries_per_limit)
+
+
+def naiveRandomPrime(bits, k=20):
+    """The loop random_prime() replaces: Miller-Rabin on every odd number from a random start."""
+    while True:
+        candidate = random.getrandbits(bits - 1) | (1 << (bits - 1)) | 1
+        while candidate.bit_length() == bits:
+            if miller_rabin(candidate, k) == 'prime':
+                return candidate
+            candidate += 2
+
+
+if __name__ == "__main__":
+    random.seed(312)
+    implementations = ["recursive", "sliding window", "montgomery", "built-in pow"]
+    test_results = {bits: {name: [] for name in implementations} for bits in bit_sizes_to_test}
+
+    for bits in bit_sizes_to_test:
+        print(f"Testing with {bits}-bit operands")
+        for i in range(trials_per_size):
+            print(f" Test {i + 1}")
+            x, y, N = newOperands(bits)
+            context = Montgomery(N) # Built once per modulus, as fermat() and miller_rabin() do with USE_MONTGOMERY
+
+            timings = {
+                "recursive": timeCall(mod_exp_recursive, x, y, N),
+                "sliding window": timeCall(mod_exp, x, y, N),
+                "montgomery": timeCall(context.exp, x, y),
+                "built-in pow": timeCall(pow, x, y, N),
+            }
+            expected = timings["built-in pow"][1]
+            for name, (elapsed_time, result) in timings.items():
+                assert result == expected, f"{name} disagrees with pow() for {bits}-bit operands"
+                print(f"  {name}: {elapsed_time:3.6f} seconds")
+                test_results[bits][name].append(elapsed_time)
+
+    # Write test results to a file
+    with open("mod_exp_benchmark_results.txt", "w") as f:
+        for bits in bit_sizes_to_test:
+            f.write(f"bits = {bits}\n")
+            for name in implementations:
+                results = test_results[bits][name]
+                f.write(f"{name}: {sum(results) / len(results):.6f} seconds\n")
+            f.write("\n")
+
+    print("Testing the sieve against the probabilistic tests")
+    with open("sieve_benchmark_results.txt", "w") as f:
+        for limit in sieve_limits_to_test:
+            build_time, lookup_time, fermat_time, mr_time = benchmarkSieve(limit)
+            # Number of queries below limit after which building the sieve has paid for itself
+            crossover = build_time / max(mr_time - lookup_time, 1e-12)
+            print(f" limit = {limit}: build {build_time:.6f} s, crossover after {crossover:.0f} queries")
+            f.write(f"limit = {limit}\n")
+            f.write(f"sieve build: {build_time:.6f} seconds\n")
+            f.write(f"sieve lookup: {lookup_time:.9f} seconds per query\n")
+            f.write(f"fermat (k = {k_for_crossover}): {fermat_time:.9f} seconds per query\n")
+            f.write(f"miller_rabin (k = {k_for_crossover}): {mr_time:.9f} seconds per query\n")
+            f.write(f"crossover: {crossover:.0f} queries\n")
+            f.write("\n")
+
+    print("Testing prime generation throughput")
+    with open("prime_generation_benchmark_results.txt", "w") as f:
+        for bits, count in primes_to_generate.items():
+            implementations = [("random_prime", random_prime)]
+            if bits <= 1024: # The naive loop takes minutes per prime beyond this
+                implementations.append(("naive", naiveRandomPrime))
+            f.write(f"bits = {bits}\n")
+            for name, generate in implementations:
+                elapsed_time = sum(timeCall(generate, bits)[0] for _ in range(count))
+                print(f" {bits} bits, {name}: {count / elapsed_time:.3f} primes/second")
+                f.write(f"{name}: {count / elapsed_time:.3f} primes/second ({count} primes in {elapsed_time:.3f} seconds)\n")
+            f.write("\n")
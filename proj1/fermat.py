@@ -1,25 +1,224 @@
+from concurrent.futures import ProcessPoolExecutor
+import collections
+import itertools
+import math
+import os
 import random
 
-def prime_test(N, k):
+from prime_sieve import PrimeSieve
+
+
+def _sieve(limit):
+    """
+    Returns every prime below limit using the Sieve of Eratosthenes.
+
+    Overall time complexity: O(limit log log limit)
+    Overall space complexity: O(limit)
+    """
+    is_prime = bytearray([1]) * limit
+    is_prime[:2] = bytes(min(limit, 2))
+    for p in range(2, math.isqrt(limit - 1) + 1 if limit > 1 else 0):
+        if is_prime[p]:
+            is_prime[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return [p for p in range(limit) if is_prime[p]]
+
+
+# Table used to reject most composites before any exponentiation is done
+SMALL_PRIME_LIMIT = 1000
+SMALL_PRIMES = _sieve(SMALL_PRIME_LIMIT)
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+SMALL_PRIMORIAL = math.prod(SMALL_PRIMES) # A single gcd with this replaces 168 trial divisions
+
+# Odd primes sieved out of each candidate window by next_prime(), with the inverse of 2 mod
+# each of them. More primes than the trial-division table, since a window is only sieved once
+# but every survivor costs a full exponentiation.
+PRIME_WINDOW = 4096 # Odd candidates per window
+WINDOW_PRIMES = _sieve(1 << 16)[1:]
+WINDOW_HALF_INVERSES = [(p + 1) // 2 for p in WINDOW_PRIMES]
+
+# prime_test() answers every N below SIEVE_LIMIT from this cache instead of testing it. The
+# sieve only grows as far as the largest N asked about so far. To keep the work across runs,
+# replace it with PrimeSieve(SIEVE_LIMIT, path=...).
+SIEVE_LIMIT = 10**7
+SIEVE = PrimeSieve(SIEVE_LIMIT)
+
+# Below DETERMINISTIC_LIMIT, Miller-Rabin with a fixed set of bases is exact. Each entry is
+# (bound, bases) such that no odd composite below bound passes all of bases, ordered so that
+# the first entry covering N is also the smallest known set for it (Jaeschke 1993,
+# Sinclair 2011 for the last one).
+DETERMINISTIC_LIMIT = 2**64
+DETERMINISTIC_WITNESSES = [
+    (2047, (2,)),
+    (9080191, (31, 73)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (DETERMINISTIC_LIMIT, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+]
+
+
+def prime_test(N, k, deterministic=False):
 	# This is main function, that is connected to the Test button. You don't need to touch it.
-	return fermat(N,k), miller_rabin(N,k)
+	if SIEVE.covers(N): # Exact, and O(1) once the sieve has grown past N
+		verdict = 'prime' if SIEVE.is_prime(N) else 'composite'
+		return verdict, verdict
+	# N - 1 = 2^s * d is factored once here and shared by every Miller-Rabin trial
+	return fermat(N,k), miller_rabin(N,k,decompose(N),deterministic)
 
 
-def mod_exp(x, y, N):
+def is_deterministic(N):
+    """
+    Returns True if miller_rabin(N, k, deterministic=True) gives an exact verdict for N.
+    """
+    return N < DETERMINISTIC_LIMIT
+
+
+def mod_exp_recursive(x, y, N):
     """
     Calculates the expression x^y (mod N) using recursion
-    
+
+    This is the original implementation. It recurses once per bit of y, so exponents longer
+    than the interpreter's recursion limit (~1000 bits) need sys.setrecursionlimit(). It is
+    only kept around so that analysis.py can benchmark the iterative engine against it.
+
     Overall time complexity: O(n^3)
     Overall space complexity: O(n^2)
     """
     if y == 0: # If we've reached the base case, return 1
         return 1
-    z = mod_exp(x, y // 2, N) # Recurse O(n) times
+    z = mod_exp_recursive(x, y // 2, N) # Recurse O(n) times
     if y % 2 == 0:
         return (z**2) % N # Multiplication of n-bit numbers is O(n^2)
     else:
         return (x * z**2) % N # Multiplication of n-bit numbers is O(n^2)
-	
+
+
+def _window_size(bits):
+    """
+    Picks the sliding-window width for an exponent with the given number of bits. Wider
+    windows save multiplications but cost 2^(w-1) precomputed odd powers, so the
+    thresholds are where one extra bit of window starts paying for itself.
+    """
+    if bits > 671:
+        return 6
+    if bits > 239:
+        return 5
+    if bits > 79:
+        return 4
+    if bits > 23:
+        return 3
+    return 1
+
+
+def _sliding_window_exp(x, y, one, mul):
+    """
+    Calculates x^y iteratively with a left-to-right sliding window, where mul(a, b) is the
+    (already reduced) product of a and b and one is the multiplicative identity. Only the
+    odd powers x^1, x^3, ..., x^(2^w - 1) are precomputed, since every window is chosen to
+    end in a 1 bit.
+
+    Overall time complexity: O(n^3), but with roughly n + n/(w + 1) multiplications instead
+    of the recursive version's n squarings plus n/2 multiplications, and no recursion
+    Overall space complexity: O(2^w * n)
+    """
+    if y == 0:
+        return one
+    bits = bin(y)[2:] # Most significant bit first
+    w = _window_size(len(bits))
+    x_squared = mul(x, x)
+    odd_powers = [x] # odd_powers[i] is x^(2i + 1)
+    for _ in range((1 << (w - 1)) - 1):
+        odd_powers.append(mul(odd_powers[-1], x_squared))
+
+    result = None # Stands in for one so that we never square the identity
+    i = 0
+    while i < len(bits):
+        if bits[i] == '0':
+            result = mul(result, result)
+            i += 1
+            continue
+        # Take the longest window of at most w bits that starts at i and ends in a 1
+        j = min(i + w, len(bits))
+        while bits[j - 1] == '0':
+            j -= 1
+        if result is not None:
+            for _ in range(j - i):
+                result = mul(result, result)
+            result = mul(result, odd_powers[int(bits[i:j], 2) >> 1])
+        else:
+            result = odd_powers[int(bits[i:j], 2) >> 1]
+        i = j
+    return result
+
+
+def mod_exp(x, y, N):
+    """
+    Calculates the expression x^y (mod N) iteratively with a sliding window
+
+    Overall time complexity: O(n^3)
+    Overall space complexity: O(n^2)
+    """
+    return _sliding_window_exp(x % N, y, 1 % N, lambda a, b: a * b % N)
+
+
+class Montgomery:
+    """
+    Montgomery-form arithmetic modulo an odd N > 1. Converting into Montgomery form costs one
+    division, but every multiplication after that is reduced with masks and shifts instead
+    of a division by N, which is meant to pay off when many exponentiations share the same
+    modulus (e.g. the k trials of fermat() and miller_rabin()). With Python's big integers the
+    masks and shifts cost more than the division they save, so it is opt-in (USE_MONTGOMERY).
+    """
+
+    def __init__(self, N):
+        assert(N > 1 and N % 2 == 1)
+        self.N = N
+        self.bits = N.bit_length() # R = 2^bits > N
+        self.mask = (1 << self.bits) - 1
+        self.N_prime = -pow(N, -1, 1 << self.bits) & self.mask # N * N_prime = -1 (mod R)
+        self.one = (1 << self.bits) % N # 1 in Montgomery form is R (mod N)
+
+    def to_montgomery(self, x):
+        return (x << self.bits) % self.N
+
+    def reduce(self, T):
+        """
+        Calculates T * R^-1 (mod N) for 0 <= T < N * R without dividing by N.
+        """
+        m = ((T & self.mask) * self.N_prime) & self.mask
+        t = (T + m * self.N) >> self.bits
+        return t - self.N if t >= self.N else t
+
+    def mul(self, a, b):
+        return self.reduce(a * b)
+
+    def exp(self, x, y):
+        """
+        Calculates x^y (mod N), where x and the result are ordinary (non-Montgomery) integers.
+        """
+        result = _sliding_window_exp(self.to_montgomery(x), y, self.one, self.mul)
+        return self.reduce(result)
+
+
+# Montgomery reduction in pure Python is slower than the sliding window's % N at every size
+# timed (see mod_exp_benchmark_results.txt), so fermat() and miller_rabin() only use it if set
+USE_MONTGOMERY = False
+
+
+def _exp_engine(N, montgomery=None):
+    """
+    Returns a function computing x^y (mod N), set up once so that repeated calls with the
+    same modulus can share it: the sliding window mod_exp(), or Montgomery(N).exp if montgomery
+    (by default USE_MONTGOMERY) is set. Montgomery form needs an odd modulus, so even N always
+    falls back to the plain sliding window.
+    """
+    if montgomery is None:
+        montgomery = USE_MONTGOMERY
+    if montgomery and N > 1 and N % 2 == 1:
+        return Montgomery(N).exp
+    return lambda x, y: mod_exp(x, y, N)
+
 
 def fprobability(k):
     """
@@ -52,30 +251,213 @@ def fermat(N,k):
     Overall time complexity: O(n^3)
     Overall space complexity: O(n^2)
     """
+    exp = _exp_engine(N) # Shared by all k trials
     for _ in range(k): # Run the test k times
         a = random.randint(1, N - 1) # We take this to be an O(1) operation
-        if mod_exp(a, N - 1, N) != 1: # If a^(N - 1) % N is not 1, we know N is composite
+        if exp(a, N - 1) != 1: # If a^(N - 1) % N is not 1, we know N is composite
             return 'composite'
     return 'prime' # If it never failed for k iterations, we believe it to be prime
 
 
-def miller_rabin(N,k):
+def decompose(N):
+    """
+    Writes N - 1 as 2^s * d with d odd, returning the pair (s, d).
+
+    Overall time complexity: O(n)
+    Overall space complexity: O(n)
+    """
+    if N < 2:
+        return 0, 0
+    s = ((N - 1) & -(N - 1)).bit_length() - 1 # Number of trailing zero bits of N - 1
+    return s, (N - 1) >> s
+
+
+def mr_witness(a, N, decomposition, exp=None):
+    """
+    Returns True if a is a witness to the compositeness of N, where decomposition is the
+    (s, d) pair from decompose(N). This does a single exponentiation a^d followed by at
+    most s - 1 squarings, rather than a fresh exponentiation for every halving of N - 1.
+
+    Overall time complexity: O(n^3)
+    Overall space complexity: O(n^2)
+    """
+    s, d = decomposition
+    x = exp(a, d) if exp is not None else mod_exp(a, d, N) # O(n^3)
+    if s == 0: # N - 1 is odd, so there is nothing to halve and only the Fermat condition applies
+        return x != 1
+    if x == 1 or x == N - 1:
+        return False
+    for _ in range(s - 1): # Each squaring is O(n^2), so this loop is O(n^3)
+        x = x * x % N
+        if x == N - 1: # a^(2^r * d) = -1 means the rest of the sequence is 1, as for primes
+            return False
+        if x == 1: # 1 reached without passing through -1: a nontrivial square root of 1
+            return True
+    return True # a^(N - 1) is either not 1 or was reached by a nontrivial square root of 1
+
+
+def deterministic_witnesses(N):
+    """
+    Returns the smallest known set of bases that decides N exactly, or None if N is too large.
+    """
+    for bound, bases in DETERMINISTIC_WITNESSES:
+        if N < bound:
+            return bases
+    return None
+
+
+def miller_rabin(N,k,decomposition=None,deterministic=False):
     """
     Applies the Miller-Rabin test k times to determine whether a given integer N is prime.
+    The decomposition N - 1 = 2^s * d is computed once (or passed in by prime_test()) and
+    shared by all k trials.
 
-    Overall time complexity: O(n^4)
+    With deterministic=True and N < 2^64, the k random bases are replaced by the fixed set
+    from deterministic_witnesses(N), and a 'prime' verdict is exact rather than probable.
+
+    Overall time complexity: O(n^3)
     Overall space complexity: O(n^2)
     """
+    if decomposition is None:
+        decomposition = decompose(N)
+    exp = _exp_engine(N) # Shared by all k trials
+    if deterministic and is_deterministic(N):
+        if N < 2 or (N % 2 == 0 and N != 2): # The witness sets only cover odd N
+            return 'composite'
+        for a in deterministic_witnesses(N): # At most 7 bases
+            a %= N
+            if a != 0 and mr_witness(a, N, decomposition, exp):
+                return 'composite'
+        return 'prime' # Proven, not just probable
     for _ in range(k): # Run the test k times
         a = random.randint(1, N - 1) # We take this to be an O(1) operation
-        if mod_exp(a, N - 1, N) != 1: # Briefly apply the Fermat test; O(n^3)
+        if mr_witness(a, N, decomposition, exp): # O(n^3)
             return 'composite'
-        e = N - 1
-        while(e % 2 == 0): # End once we get to an odd exponent: O(n)
-            e //= 2 # Since e is even, it doesn't matter if we use /= or //= . This is O(n)
-            x = mod_exp(a, e, N) # Time complexity of mod_exp is O(n^3)
-            if x == N - 1: # This is what we should expect for primes
-                break
-            elif x != 1: # This guarantees that N is composite
-                return 'composite'
     return 'prime' # If it never failed for k iterations, we believe it to be prime
+
+
+def trial_division(N):
+    """
+    Decides N using only the small prime table, returning 'prime' or 'composite', or None if
+    N has no small factor but is too large for that to prove it prime.
+
+    Overall time complexity: O(n^2) for the gcd with the (constant-size) primorial
+    Overall space complexity: O(n)
+    """
+    if N < SMALL_PRIME_LIMIT:
+        return 'prime' if N in SMALL_PRIME_SET else 'composite'
+    if math.gcd(N, SMALL_PRIMORIAL) != 1:
+        return 'composite'
+    if N < SMALL_PRIME_LIMIT ** 2: # No prime factor up to sqrt(N)
+        return 'prime'
+    return None
+
+
+def _miller_rabin_chunk(chunk, k):
+    # Runs in a worker process, so it has to be a module-level function
+    return [miller_rabin(N, k) for N in chunk]
+
+
+def prime_test_batch(iterable, k, workers=None, chunksize=4096):
+    """
+    Generator yielding the Miller-Rabin verdict ('prime' or 'composite') for each integer of
+    iterable, in input order. Each chunk of chunksize candidates is screened with
+    trial_division() in this process, and only the survivors are sent to miller_rabin() in a
+    pool of workers processes (default: one per CPU). At most two chunks per worker are in
+    flight at a time, so memory stays flat no matter how long iterable is.
+
+    Overall time complexity: O(m * n^3 / workers) for m candidates of n bits
+    Overall space complexity: O(workers * chunksize * n)
+    """
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(iterable)
+    pending = collections.deque() # (verdicts, future) pairs, oldest chunk first
+    exhausted = False
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk = list(itertools.islice(iterator, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                verdicts = [trial_division(N) for N in chunk]
+                survivors = [N for N, verdict in zip(chunk, verdicts) if verdict is None]
+                future = pool.submit(_miller_rabin_chunk, survivors, k) if survivors else None
+                pending.append((verdicts, future))
+            if pending:
+                verdicts, future = pending.popleft()
+                results = iter(future.result() if future is not None else ())
+                for verdict in verdicts:
+                    yield verdict if verdict is not None else next(results)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _window_candidates(start):
+    """
+    Generator of the odd integers >= start (start > WINDOW_PRIMES[-1]) that have no factor in
+    WINDOW_PRIMES. Candidates are sieved PRIME_WINDOW at a time, and the residues of the window
+    base mod each prime are carried over when the window slides instead of being recomputed
+    from the (big) base.
+
+    Overall time complexity: O(m log log B) per window of m candidates, after an O(n) setup
+    per sieving prime
+    Overall space complexity: O(m + B / log B) for sieving primes up to B
+    """
+    base = start | 1 # window[j] stands for base + 2j
+    residues = [base % p for p in WINDOW_PRIMES]
+    step = 2 * PRIME_WINDOW
+    while True:
+        window = bytearray(PRIME_WINDOW)
+        for i, p in enumerate(WINDOW_PRIMES):
+            # base + 2j = 0 (mod p)  <=>  j = -residue * 2^-1 (mod p)
+            j = (p - residues[i]) * WINDOW_HALF_INVERSES[i] % p
+            if j < PRIME_WINDOW:
+                window[j::p] = b'\x01' * len(range(j, PRIME_WINDOW, p))
+            residues[i] = (residues[i] + step) % p # Slide to the next window
+        j = window.find(0)
+        while j != -1:
+            yield base + 2 * j
+            j = window.find(0, j + 1)
+        base += step
+
+
+def next_prime(n, k=20):
+    """
+    Returns the smallest prime greater than n. Only candidates that survive sieving by
+    WINDOW_PRIMES are given to miller_rabin(), which is exact below 2^64 and wrong with
+    probability at most 4^-k above it.
+
+    Overall time complexity: O(n^4) expected, since primes are O(n) apart and each
+    Miller-Rabin test is O(n^3)
+    Overall space complexity: O(n^2)
+    """
+    if n < WINDOW_PRIMES[-1]: # The window sieve would strike out the sieving primes themselves
+        candidate = max(n + 1, 2)
+        while True:
+            verdict = trial_division(candidate)
+            if verdict is None:
+                verdict = miller_rabin(candidate, k, deterministic=True)
+            if verdict == 'prime':
+                return candidate
+            candidate += 1
+    for candidate in _window_candidates(n + 1):
+        if miller_rabin(candidate, k, deterministic=True) == 'prime':
+            return candidate
+
+
+def random_prime(bits, k=20):
+    """
+    Returns a random prime with exactly bits bits, by searching upwards with next_prime() from a
+    random bits-bit starting point.
+
+    Overall time complexity: O(n^4) expected
+    Overall space complexity: O(n^2)
+    """
+    assert(bits >= 2)
+    while True:
+        start = random.getrandbits(bits - 1) | (1 << (bits - 1)) # Top bit always set
+        prime = next_prime(start - 1, k)
+        if prime.bit_length() == bits: # Otherwise we ran off the top; try again
+            return prime
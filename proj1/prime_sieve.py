@@ -0,0 +1,127 @@
+import math
+import mmap
+import os
+
+# Layout of a persisted sieve: MAGIC, then the covered limit as 8 little-endian bytes, then
+# one byte per odd number below the limit
+MAGIC = b'CS312SV1'
+HEADER_SIZE = len(MAGIC) + 8
+
+# Number of odd numbers sieved at a time, so each base prime sweeps a cache-sized window
+SEGMENT_SIZE = 1 << 18
+
+
+class PrimeSieve:
+    """
+    Segmented Sieve of Eratosthenes that grows on demand. Byte i of the table stands for the
+    odd number 2i + 1 and is 1 if that number is composite, so even numbers take no space at
+    all and a lookup is a single index. If path is given, the table lives in an mmap'd file
+    and is reused by the next PrimeSieve opened on the same path, so a restart doesn't redo
+    the sieving.
+
+    The table never grows past max_limit; callers are expected to check covers() first.
+    """
+
+    def __init__(self, max_limit=10**8, path=None):
+        self.max_limit = max_limit
+        self.path = path
+        self.limit = 0 # Every number below limit has been sieved
+        self.table = bytearray()
+        self._file = None
+        if path is not None:
+            new_file = not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE
+            self._file = open(path, 'w+b' if new_file else 'r+b')
+            if new_file:
+                self._file.write(MAGIC + bytes(8))
+                self._file.flush()
+            self._remap(None)
+            if not new_file:
+                if self.table[:len(MAGIC)] != MAGIC:
+                    raise ValueError('{} is not a prime sieve file'.format(path))
+                self.limit = int.from_bytes(self.table[len(MAGIC):HEADER_SIZE], 'little')
+        if self.limit == 0:
+            self._grow(min(1024, max_limit))
+
+    def covers(self, N):
+        return N < self.max_limit
+
+    def is_prime(self, N):
+        """
+        Returns True if N is prime, sieving further first if N is above the current limit.
+
+        Overall time complexity: O(1) once N is covered
+        Overall space complexity: O(1)
+        """
+        if N >= self.limit:
+            assert(self.covers(N))
+            self._grow(min(max(N + 1, 2 * self.limit), self.max_limit))
+        if N % 2 == 0:
+            return N == 2
+        return N > 1 and self.table[self._offset + (N >> 1)] == 0
+
+    def close(self):
+        if self._file is not None:
+            self.table.flush()
+            self.table.close()
+            self._file.close()
+            self._file = None
+
+    @property
+    def _offset(self):
+        return HEADER_SIZE if self._file is not None else 0
+
+    def _remap(self, size):
+        """
+        (Re)maps the backing file, first resizing it to hold size odd numbers. A size of None
+        maps the file as it is.
+        """
+        if isinstance(self.table, mmap.mmap):
+            self.table.flush()
+            self.table.close()
+        if size is not None:
+            self._file.truncate(HEADER_SIZE + size)
+        self.table = mmap.mmap(self._file.fileno(), 0)
+
+    def _write_limit(self):
+        self.table[len(MAGIC):HEADER_SIZE] = self.limit.to_bytes(8, 'little')
+
+    def _grow(self, new_limit):
+        """
+        Extends the table to cover every number below new_limit, one segment at a time. The
+        base primes up to sqrt(new_limit) come from the table itself, so it first grows far
+        enough to hold them.
+
+        Overall time complexity: O(m log log m) for m = new_limit
+        Overall space complexity: O(m)
+        """
+        new_limit += new_limit % 2 # Keep the limit even, so it is always 2 * (table size)
+        if new_limit <= self.limit:
+            return
+        root = math.isqrt(new_limit - 1)
+        if root >= self.limit and self.limit > 0:
+            self._grow(root + 1)
+        old_size, new_size = self.limit // 2, new_limit // 2
+        if self._file is not None:
+            self._remap(new_size)
+        else:
+            self.table.extend(bytes(new_size - old_size))
+        offset = self._offset
+
+        if old_size == 0: # 1 is not prime, and the first segment also has to find the base primes
+            self.table[offset] = 1
+        for lo in range(old_size, new_size, SEGMENT_SIZE):
+            hi = min(lo + SEGMENT_SIZE, new_size)
+            for p in range(3, math.isqrt(2 * hi - 1) + 1, 2):
+                if self.table[offset + (p >> 1)]: # Only primes sieve
+                    continue
+                # First odd multiple of p that is at least p^2 and lands in this segment
+                first = max(p * p, (2 * lo + 1 + p - 1) // p * p)
+                if first % 2 == 0:
+                    first += p
+                start = first >> 1
+                if start < hi:
+                    count = len(range(start, hi, p))
+                    self.table[offset + start:offset + hi:p] = b'\x01' * count
+        self.limit = new_limit
+        if self._file is not None:
+            self._write_limit()
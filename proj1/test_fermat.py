@@ -0,0 +1,134 @@
+"""test_fermat.py: Miller-Rabin in fermat.py against the original per-base logic (run with pytest)."""
+
+import itertools
+import math
+import random
+
+import pytest
+
+from fermat import PRIME_WINDOW, WINDOW_PRIMES, _sieve, _window_candidates, decompose, miller_rabin, mr_witness, next_prime
+from prime_sieve import SEGMENT_SIZE, PrimeSieve
+
+# Carmichael numbers fool the Fermat test for every base coprime to N
+CARMICHAEL_NUMBERS = [561, 1105, 1729, 2465, 2821, 6601, 8911, 10585, 15841, 29341, 41041, 46657, 52633]
+# Strong pseudoprimes to base 2 (and, for 1373653 and 25326001, to bases 2 and 3)
+STRONG_PSEUDOPRIMES = [2047, 3277, 4033, 4681, 8321, 15841, 29341, 42799, 49141, 52633, 65281, 1373653, 25326001]
+PRIMES = [2, 3, 5, 7, 11, 13, 97, 7919, 65537]
+# Strong pseudoprimes to every prime base up to 7, 11, 13, 17 and 23 respectively
+FIXED_BASE_PSEUDOPRIMES = [3215031751, 2152302898747, 3474749660383, 341550071728321, 3825123056546413051]
+# Spans several sieve segments, and its square root is past the first 1024 numbers sieved
+SIEVE_TEST_LIMIT = 6 * SEGMENT_SIZE + 2
+# Primes near the top of each range of DETERMINISTIC_WITNESSES
+DETERMINISTIC_PRIMES = [2039, 9080189, 4759123129, 2**61 - 1, 18446744073709551557]
+
+
+def legacy_witness(a, N):
+    """The per-base check from the original miller_rabin(), which re-exponentiates for every halving of N - 1."""
+    if pow(a, N - 1, N) != 1:
+        return True
+    e = N - 1
+    while e % 2 == 0:
+        e //= 2
+        x = pow(a, e, N)
+        if x == N - 1:
+            break
+        elif x != 1:
+            return True
+    return False
+
+
+def is_prime_by_trial_division(N):
+    """The plain definition, for checking the exact modes on small N."""
+    if N < 2:
+        return False
+    return all(N % p for p in range(2, math.isqrt(N) + 1))
+
+
+def check_every_base(N):
+    """mr_witness() agrees with legacy_witness() for every base of N (or 2000 seeded ones for large N)."""
+    decomposition = decompose(N)
+    bases = range(1, N) if N < 100000 else random.Random(N).sample(range(1, N), 2000)
+    for a in bases:
+        assert mr_witness(a, N, decomposition) == legacy_witness(a, N), f"witness mismatch for a = {a}, N = {N}"
+
+
+@pytest.mark.parametrize("N", CARMICHAEL_NUMBERS)
+def test_carmichael_numbers(N):
+    check_every_base(N)
+    assert miller_rabin(N, 20) == 'composite'
+
+
+@pytest.mark.parametrize("N", STRONG_PSEUDOPRIMES)
+def test_strong_pseudoprimes(N):
+    check_every_base(N)
+    assert miller_rabin(N, 20) == 'composite'
+
+
+@pytest.mark.parametrize("N", PRIMES)
+def test_primes(N):
+    check_every_base(N)
+    assert miller_rabin(N, 20) == 'prime'
+
+
+@pytest.mark.parametrize("N", FIXED_BASE_PSEUDOPRIMES)
+def test_deterministic_fixed_base_pseudoprimes(N):
+    assert miller_rabin(N, 1, deterministic=True) == 'composite'
+
+
+@pytest.mark.parametrize("N", DETERMINISTIC_PRIMES)
+def test_deterministic_primes(N):
+    assert miller_rabin(N, 1, deterministic=True) == 'prime'
+
+
+def test_deterministic_small_n():
+    for N in range(4, 20000):
+        expected = 'prime' if is_prime_by_trial_division(N) else 'composite'
+        assert miller_rabin(N, 1, deterministic=True) == expected, f"N = {N}"
+
+
+@pytest.mark.parametrize("N, expected", [(0, 'composite'), (1, 'composite'), (2, 'prime'), (3, 'prime')])
+def test_deterministic_edge_cases(N, expected):
+    assert miller_rabin(N, 1, deterministic=True) == expected
+
+
+def test_prime_sieve_grows():
+    expected = _sieve(SIEVE_TEST_LIMIT)
+    sieve = PrimeSieve(SIEVE_TEST_LIMIT)
+    assert [N for N in range(SIEVE_TEST_LIMIT) if sieve.is_prime(N)] == expected # Grows a doubling at a time
+
+
+def test_prime_sieve_file_reopens(tmp_path, monkeypatch):
+    path = str(tmp_path / "sieve.bin")
+    expected = _sieve(SIEVE_TEST_LIMIT)
+    sieve = PrimeSieve(SIEVE_TEST_LIMIT, path)
+    grown_to = []
+    grow = PrimeSieve._grow
+    def record_grow(self, new_limit):
+        grown_to.append(new_limit)
+        grow(self, new_limit)
+    monkeypatch.setattr(PrimeSieve, "_grow", record_grow)
+    # One jump past the first 1024 numbers, so _grow() first grows far enough for the base primes
+    assert sieve.is_prime(SIEVE_TEST_LIMIT - 1) == (expected[-1] == SIEVE_TEST_LIMIT - 1)
+    assert grown_to == [SIEVE_TEST_LIMIT, math.isqrt(SIEVE_TEST_LIMIT - 1) + 1]
+    limit = sieve.limit
+    sieve.close()
+
+    reopened = PrimeSieve(SIEVE_TEST_LIMIT, path)
+    assert reopened.limit == limit
+    assert [N for N in range(limit) if reopened.is_prime(N)] == expected
+    reopened.close()
+
+
+def test_window_candidates_slide():
+    # Just above the largest sieving prime every composite has a small factor, so the candidates
+    # over several windows are exactly the primes there
+    start = WINDOW_PRIMES[-1] + 1
+    end = start + 3 * 2 * PRIME_WINDOW
+    candidates = list(itertools.takewhile(lambda N: N < end, _window_candidates(start)))
+    assert candidates == [p for p in _sieve(end) if p >= start]
+
+
+@pytest.mark.parametrize("n", [65520, 65521, 10**12])
+def test_next_prime(n):
+    expected = next(N for N in itertools.count(n + 1) if is_prime_by_trial_division(N))
+    assert next_prime(n) == expected
@@ -2,10 +2,10 @@
 
 
 import math
-import random
 import signal
 import sys
-import time
+
+import numpy as np
 
 
 from which_pyqt import PYQT_VER
@@ -30,6 +30,7 @@ else:
 
 # Import the code with the actual implementation
 from convex_hull import *
+from point_generators import QPointFSequence, gaussian, spherical, uniform_disc
 #from convex_hull_complete_nonthread import *
 
 
@@ -70,7 +71,7 @@ class PointLineView( QWidget ):
 		if color in self.pointList:
 			self.pointList[color].extend( point_list )
 		else:
-			self.pointList[color] = point_list
+			self.pointList[color] = list( point_list )
 
 	def addLines( self, line_list, color ):
 		if color in self.lineList:
@@ -133,48 +134,19 @@ class Proj2GUI( QMainWindow ):
 		# TODO - ERROR CHECKING!!!!
 		if self.randBySeed.isChecked():
 			seed = int(self.randSeed.text())
-			random.seed( seed )
 		else: # do by time
-			random.seed( time.time() )
+			seed = None
 
-		ptlist = []
-		unique_xvals = {}
-		max_r  = 0.98
-		WIDTH  = 1.0
-		HEIGHT = 1.0
+		# The points are drawn in bulk as an array, and the QPointF objects made as they are used
+		rng = np.random.default_rng( seed )
 		npoints = int(self.npoints.text())
 		if self.distribOval.isChecked():
-			while len(ptlist) < npoints:
-				x = random.uniform(-1.0,1.0)
-				y = random.uniform(-1.0,1.0)
-				if x**2+y**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1      # dict/map with float keys?
+			points = uniform_disc( npoints, rng )
 		elif self.distribSphere.isChecked():
-			while len(ptlist) < npoints:
-				x = random.uniform(-1.0,1.0)
-				y = random.uniform(-1.0,1.0)
-				z = random.uniform(-1.0,1.0)
-				if x**2 + y**2 + z**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
+			points = spherical( npoints, rng )
 		elif self.distribGaussian.isChecked():
-			while len(ptlist) < npoints:
-				x = random.gauss(0.0,0.25)
-				y = random.gauss(0.0,0.25)
-				if x**2+y**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
-		return ptlist
+			points = gaussian( npoints, rng )
+		return QPointFSequence( points )
 
 # Methods that handle GUI events
 	def clearClicked(self):
@@ -204,7 +176,7 @@ class Proj2GUI( QMainWindow ):
 		self.solveButton.setEnabled(False)
 		self.view.update()
 		app.processEvents()							#Why is this necessary?????
-		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view)
+		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view,prefilter=self.usePrefilter.isChecked())
 		self.generateButton.setEnabled(True)
 		self.clearButton.setEnabled(True)
 		self.view.update()
@@ -243,6 +215,7 @@ class Proj2GUI( QMainWindow ):
 		self.randSeed       = QLineEdit('0')
 
 		self.showRecursion	= QCheckBox('Show Recursion')
+		self.usePrefilter	= QCheckBox('Akl-Toussaint Prefilter')
 
 		h = QHBoxLayout()
 		h.addWidget( self.view )
@@ -278,6 +251,7 @@ class Proj2GUI( QMainWindow ):
 		h.addWidget( self.randBySeed )
 		h.addWidget( self.randSeed )
 		h.addStretch(1)
+		h.addWidget(self.usePrefilter)
 		h.addWidget(self.showRecursion)
 		vbox.addLayout(h)
 
@@ -1,58 +1,132 @@
-from convex_hull import ConvexHullSolver
-import random
-import time
-
-from PyQt6.QtWidgets import *
-from PyQt6.QtGui import *
-from PyQt6.QtCore import *
+from benchmark import Benchmark
+from concurrent.futures import ProcessPoolExecutor
+from convex_hull_core import as_points, chan, compute_hull, divide_and_conquer, indexed_divide_and_conquer, parallel_divide_and_conquer, sort_points, DynamicHull
+from convex_hull_numpy import monotone_chain
+import numpy as np
+import os
+from point_generators import generate
+from streaming_hull import streaming_hull, write_points
+import tempfile
+import tracemalloc
 
 n_values_to_test = [10, 100, 1000, 5000, 10000, 50000, 100000, 250000, 500000, 750000, 1000000]
-def newPoints(num_points):
-    random.seed(time.time())
-    
-    ptlist = []
-    unique_xvals = {}
-    max_r = 0.98
-    WIDTH = 1.0
-    HEIGHT = 1.0
-    
-    while len(ptlist) < num_points:
-        x = random.uniform(-1.0, 1.0)
-        y = random.uniform(-1.0, 1.0)
-        if x ** 2 + y ** 2 <= max_r ** 2:
-            xval = WIDTH * x
-            yval = HEIGHT * y
-            if xval not in unique_xvals:
-                ptlist.append(QPointF(xval, yval))
-                unique_xvals[xval] = 1
-    return ptlist
-    
+dynamic_inserts_to_test = 100000
+dynamic_recompute_stride = 5000
+streaming_points_to_test = 2000000
+streaming_chunk_size = 1 << 18
+
+
+def peakMemory(fn, *args):
+    """
+    Peak memory in bytes allocated while running fn(*args), measured with tracemalloc. Tracing
+    slows everything down, so this is a separate run from the timed one.
+    """
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def newPoints(num_points, seed=0, distribution="uniform_disc"):
+    """num_points (x, y) tuples from one of point_generators.DISTRIBUTIONS, generated in bulk."""
+    return as_points(generate(distribution, num_points, seed))
+
+
+def insertAll(points):
+    """Inserts points into a DynamicHull one at a time, taking the hull after each; returns the last."""
+    hull = DynamicHull()
+    for p in points:
+        hull.insert(p)
+        snapshot = hull.hull()
+    return snapshot
+
+
+def benchmarkDynamicHull(bench, num_inserts, stride):
+    """
+    Times a stream of num_inserts points where the hull is needed after every insert, with
+    DynamicHull and by recomputing it from scratch. Recomputing after every insert would take
+    hours, so compute_hull() is timed every stride inserts (the "recompute_hull" rows) and
+    each of those medians stands in for the stride inserts around it. The "dynamic_hull" row
+    is annotated with its throughput and that estimate of the total recompute time.
+    """
+    points = newPoints(num_inserts)
+
+    recompute_time = 0
+    for k in range(stride, num_inserts + 1, stride):
+        expected = bench.time("recompute_hull", k, compute_hull, points[:k])
+        recompute_time += stride * bench.rows[-1]["median"]
+
+    snapshot = bench.time("dynamic_hull", num_inserts, insertAll, points)
+    assert list(snapshot) == expected
+    bench.annotate(inserts_per_second=num_inserts / bench.rows[-1]["median"],
+                   recompute_estimate=recompute_time, recompute_stride=stride)
+
+
+def benchmarkStreamingHull(bench, num_points, chunk_size):
+    """
+    Times streaming_hull() over a file of num_points uniform points, and annotates the row with
+    its throughput and peak memory in bytes. The points are written as raw float64 pairs to a
+    temporary file, generated in chunks so the benchmark itself never holds them all.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "points.bin")
+        with open(path, "wb") as f:
+            for lo in range(0, num_points, chunk_size):
+                write_points(f, newPoints(min(chunk_size, num_points - lo), lo))
+
+        hull, n = bench.time("streaming_hull", num_points, streaming_hull, path, chunk_size)
+        assert n == num_points
+        bench.annotate(points_per_second=num_points / bench.rows[-1]["median"], chunk_size=chunk_size,
+                       peak_bytes=peakMemory(streaming_hull, path, chunk_size))
+
+
 if __name__ == "__main__":
-    test_results = {n_value: [] for n_value in n_values_to_test}
+    bench = Benchmark("convex_hull", seed=312)
+    workers = os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) # Started once, outside the timings
     
     for n_value in n_values_to_test:
         print(f"Testing with n = {n_value}")
-        for i in range(5):
-            # Generate random points
-            print(f" Test {i + 1}")
-            points = newPoints(n_value)
-            points.sort(key=lambda p: p.x())
-            solver = ConvexHullSolver()
-            t1 = time.time()
-            hull = solver.divide_and_conquer(points)  # Replace this function with your own
-            t2 = time.time()
-            
-            elapsed_time = t2 - t1
-            print(f"  Elapsed time: {elapsed_time:3.3f} seconds")
-            test_results[n_value].append(elapsed_time)
-            
-    finalResults = {}
-    for n_value, results in test_results.items():
-        finalResults[n_value] = sum(results) / len(results)
-    
-    # Write test results to a file
-    with open("convex_hull_benchmark_results.txt", "w") as f:
-        for n_value in n_values_to_test:
-            f.write(f"n = {n_value}\n")
-            f.write(f"Average time: {finalResults[n_value]} seconds\n")
-            f.write("\n")
\ No newline at end of file
+        points = newPoints(n_value, bench.seed + n_value)
+
+        # The sort is timed on its own, so the hull timings below are for the algorithm alone
+        sorted_points = bench.time("sort_points", n_value, sort_points, points)
+
+        hull = bench.time("divide_and_conquer", n_value, divide_and_conquer, sorted_points)
+        bench.annotate(h=len(hull), h_over_n=len(hull) / n_value, peak_bytes=peakMemory(divide_and_conquer, sorted_points))
+
+        bench.time("indexed_divide_and_conquer", n_value, indexed_divide_and_conquer, sorted_points)
+        bench.annotate(peak_bytes=peakMemory(indexed_divide_and_conquer, sorted_points))
+
+        bench.time("parallel_divide_and_conquer", n_value, parallel_divide_and_conquer, sorted_points, workers, pool)
+        bench.annotate(workers=workers)
+
+        # These two take the points unsorted: monotone_chain() does its own (vectorized) sort,
+        # and chan() only sorts its groups of m points
+        bench.time("monotone_chain", n_value, monotone_chain, np.array(points))
+        bench.time("chan", n_value, chan, points)
+
+        for row in bench.rows[-6:]:
+            print(f"  {row['label']}: median {row['median']:3.6f} s, p95 {row['p95']:3.6f} s")
+        print(f"  h = {len(hull)}, h/n = {len(hull) / n_value:.5f}")
+    pool.shutdown()
+
+    for label in ["sort_points", "divide_and_conquer", "indexed_divide_and_conquer", "parallel_divide_and_conquer", "monotone_chain", "chan"]:
+        for model in ["n", "nlogn"]:
+            c, error = bench.fit(label, model)
+            print(f"{label}: {c:.3e} s x {model} (relative RMS error {error:.3f})")
+
+    print(f"Testing {dynamic_inserts_to_test} sequential inserts")
+    benchmarkDynamicHull(bench, dynamic_inserts_to_test, dynamic_recompute_stride)
+    row = bench.rows[-1]
+    print(f"  DynamicHull: median {row['median']:3.6f} s, {row['inserts_per_second']:.0f} inserts/second")
+    print(f"  Recompute after every insert (estimated from every {dynamic_recompute_stride}th): {row['recompute_estimate']:.1f} s")
+
+    print(f"Testing streaming_hull() over a file of {streaming_points_to_test} points")
+    benchmarkStreamingHull(bench, streaming_points_to_test, streaming_chunk_size)
+    row = bench.rows[-1]
+    print(f"  median {row['median']:3.6f} s, {row['points_per_second']:.0f} points/second, peak {row['peak_bytes']} bytes")
+
+    bench.write_json("convex_hull_benchmark_results.json")
+    bench.write_csv("convex_hull_benchmark_results.csv")
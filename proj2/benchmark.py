@@ -0,0 +1,145 @@
+"""benchmark.py: Small benchmarking harness for the analysis scripts.
+
+Runs are timed with time.perf_counter_ns() after some untimed warmup runs, with the garbage
+collector paused as timeit does, and summarized by their median, 95th percentile, mean and
+standard deviation. Complexity constants are fitted to the medians, and everything is written
+out as JSON and CSV so runs can be compared.
+"""
+
+import csv
+import gc
+import json
+import math
+import platform
+import statistics
+import time
+
+WARMUP = 1
+REPEAT = 5
+
+# Growth models for fit(), by name
+COMPLEXITY_MODELS = {
+    'logn': lambda n: math.log2(n),
+    'n': lambda n: n,
+    'nlogn': lambda n: n * math.log2(n),
+    'n^2': lambda n: n * n,
+}
+
+
+def percentile(samples, q):
+    """The q-th percentile (0 <= q <= 100) of sorted samples, interpolating between ranks."""
+    rank = (len(samples) - 1) * q / 100
+    lo = math.floor(rank)
+    hi = min(lo + 1, len(samples) - 1)
+    return samples[lo] + (samples[hi] - samples[lo]) * (rank - lo)
+
+
+def summarize(samples_ns):
+    """Summary statistics, in seconds, of a list of run times in nanoseconds."""
+    samples = sorted(s / 1e9 for s in samples_ns)
+    return {
+        'runs': len(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'mean': statistics.fmean(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min': samples[0],
+        'max': samples[-1],
+    }
+
+
+def measure(fn, *args, warmup=WARMUP, repeat=REPEAT, setup=None):
+    """
+    Runs fn(*args) warmup times untimed and then repeat times timed, calling setup() (if given)
+    untimed before every run. Returns (run times in nanoseconds, result of the last run).
+    """
+    samples = []
+    result = None
+    for run in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            result = fn(*args)
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if run >= warmup:
+            samples.append(elapsed)
+    return samples, result
+
+
+class Benchmark:
+    """
+    A set of timings: one row per (label, n), each with its summary statistics and any extra
+    values attached with annotate(). seed is recorded in the output; the caller uses it (or
+    seeds derived from it) to generate the inputs, so reruns time the same inputs.
+    """
+
+    def __init__(self, name, seed=0, warmup=WARMUP, repeat=REPEAT):
+        self.name = name
+        self.seed = seed
+        self.warmup = warmup
+        self.repeat = repeat
+        self.rows = []
+        self.fits = []
+
+    def time(self, label, n, fn, *args, warmup=None, repeat=None, setup=None):
+        """Times fn(*args) as measure() does, records a row for it and returns fn's result."""
+        samples, result = measure(fn, *args,
+                                  warmup=self.warmup if warmup is None else warmup,
+                                  repeat=self.repeat if repeat is None else repeat,
+                                  setup=setup)
+        self.record(label, n, samples)
+        return result
+
+    def record(self, label, n, samples_ns):
+        row = {'label': label, 'n': n}
+        row.update(summarize(samples_ns))
+        self.rows.append(row)
+        return row
+
+    def annotate(self, **values):
+        """Attaches extra values (hull size, peak memory, ...) to the last row recorded."""
+        self.rows[-1].update(values)
+
+    def fit(self, label, model):
+        """
+        Fits median time = c * model(n) over the rows for label, where model names one of
+        COMPLEXITY_MODELS, minimizing the relative error so the small sizes count as much as
+        the large ones. Records and returns c (seconds per unit of model(n)) along with the
+        relative RMS error of the fit, which is small when the model matches.
+        """
+        f = COMPLEXITY_MODELS[model]
+        points = [(f(row['n']), row['median']) for row in self.rows
+                  if row['label'] == label and row['n'] > 1 and row['median'] > 0]
+        c = sum(x / t for x, t in points) / sum((x / t) ** 2 for x, t in points)
+        error = math.sqrt(sum(((c * x - t) / t) ** 2 for x, t in points) / len(points))
+        self.fits.append({'label': label, 'model': model, 'constant': c, 'relative_rms_error': error})
+        return c, error
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                'benchmark': self.name,
+                'seed': self.seed,
+                'warmup': self.warmup,
+                'repeat': self.repeat,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': self.rows,
+                'fits': self.fits,
+            }, f, indent=2)
+
+    def write_csv(self, path):
+        """One line per row; extra values from annotate() get their own columns."""
+        columns = []
+        for row in self.rows:
+            columns.extend(key for key in row if key not in columns)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(self.rows)
@@ -0,0 +1,646 @@
+"""convex_hull_core.py: Qt-free convex hull algorithms.
+
+Points are (x, y) tuples, so this module can be imported by batch jobs and benchmarks
+without pulling in PyQt. convex_hull.ConvexHullSolver is a thin GUI adapter around it.
+"""
+
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+
+# Relative error bound of the floating point cross product in orientation(), from Shewchuk's
+# "Adaptive Precision Floating-Point Arithmetic and Fast Robust Geometric Predicates"
+EPSILON = 2.0 ** -53
+ORIENTATION_ERRBOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+
+# Integer type of the successor arrays of indexed_divide_and_conquer(); 4 bytes covers 2^31 points
+LINK_TYPECODE = 'i'
+LINK_SIZE = array(LINK_TYPECODE).itemsize
+
+# Target number of points per block in the dynamic hull's chains. Blocks split at twice this.
+BLOCK_SIZE = 256
+
+
+def as_points(points):
+    """
+    Converts points to a list of (x, y) tuples. Accepts (x, y) pairs, objects with x() and y()
+    methods (such as QPointF) or an (n, 2) array.
+    """
+    if hasattr(points, 'tolist'): # NumPy array
+        points = points.tolist()
+    points = list(points)
+    if points and callable(getattr(points[0], 'x', None)):
+        return [(p.x(), p.y()) for p in points]
+    return [(p[0], p[1]) for p in points]
+
+
+def orientation(a, b, c):
+    """
+    Orientation of the triangle a -> b -> c: positive if it turns counterclockwise, negative
+    if clockwise, and exactly zero only if the three points are collinear. No division, so
+    points sharing an x value are fine.
+
+    The cross product is first computed in floating point. If it is larger than its worst
+    case rounding error (Shewchuk's bound for orient2d), its sign is right and it is returned
+    as is, which is almost always the case. Otherwise the answer comes from
+    _exact_orientation().
+
+    Time complexity: O(1)
+    Space complexity: O(1)
+    """
+    acx, bcx = a[0] - c[0], b[0] - c[0]
+    acy, bcy = a[1] - c[1], b[1] - c[1]
+    detleft = acx * bcy
+    detright = acy * bcx
+    det = detleft - detright
+    errbound = ORIENTATION_ERRBOUND * (abs(detleft) + abs(detright))
+    if det > errbound or -det > errbound:
+        return det
+    return _exact_orientation(a, b, c, acx, bcx, acy, bcy)
+
+
+def _sign(v):
+    return (v > 0) - (v < 0)
+
+
+def _exact_orientation(a, b, c, acx, bcx, acy, bcy):
+    # A floating point difference is zero only if the operands are equal, and otherwise has the
+    # right sign. So when one product has a zero factor, as for points sharing an x or y value
+    # on gridded data, the sign of the other product is exact without any arithmetic.
+    if acx == 0 or bcy == 0:
+        return -_sign(acy) * _sign(bcx)
+    if acy == 0 or bcx == 0:
+        return _sign(acx) * _sign(bcy)
+    # Every float is n / 2^k, so scaling to the largest denominator turns all six coordinates
+    # into integers, which Python multiplies exactly
+    ratios = [v.as_integer_ratio() for v in (a[0], a[1], b[0], b[1], c[0], c[1])]
+    scale = max(d for _, d in ratios)
+    ax, ay, bx, by, cx, cy = [n * (scale // d) for n, d in ratios]
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def sort_points(points):
+    """
+    Sorts points by (x, y) and drops repeated points, as divide_and_conquer() and its variants
+    expect. Sorting on y as well makes the order strict even when points share an x value.
+
+    Time complexity: O(nlogn)
+    Space complexity: O(n)
+    """
+    points = sorted(points)
+    return [p for i, p in enumerate(points) if i == 0 or p != points[i - 1]]
+
+
+def merge_hulls(left, right):
+    """ 
+    Complexity analysis with respect to n (the number of points in the left and right hulls)
+
+    Every point of left comes before every point of right in (x, y) order. The tangents are
+    walked with orientation() tests: an endpoint moves while its neighbour lies strictly
+    outside the current tangent line, or on it but farther out, so collinear points never end
+    up as hull vertices.
+
+    Time complexity:
+        Identifying the rightmost point in the left hull is O(n)
+        Finding upper tangent is O(n)
+        Finding lower tangent is O(n)
+        Accessing values and concatenating existing arrays is O(1)
+        Overall time complexity: O(n)
+
+    Space complexity:
+        Storing initial arrays is O(n)
+        Creating temporary variables is O(1)
+        Splicing and concatenating existing arrays is O(n)
+        Overall space complexity: O(n)
+    """
+    upper_left = max(range(len(left)), key=lambda i: left[i]) # Last in (x, y) order
+    bottom_left = upper_left
+    upper_right = 0 # The hulls start from their first point in (x, y) order
+    bottom_right = upper_right
+
+    # find upper tangent
+    moved = True
+    while moved: # This overall loop is O(n) time complexity
+        moved = False
+        while True:
+            # move upper_left counterclockwise while its neighbour is above the tangent line
+            candidate = (upper_left - 1) % len(left)
+            turn = orientation(left[upper_left], right[upper_right], left[candidate])
+            if turn > 0 or (turn == 0 and left[candidate] < left[upper_left]):
+                upper_left = candidate
+                moved = True
+            else:
+                break
+        while True:
+            # move upper_right clockwise while its neighbour is above the tangent line
+            candidate = (upper_right + 1) % len(right)
+            turn = orientation(left[upper_left], right[upper_right], right[candidate])
+            if turn > 0 or (turn == 0 and right[candidate] > right[upper_right]):
+                upper_right = candidate
+                moved = True
+            else:
+                break
+
+    # find lower tangent
+    moved = True
+    while moved: # This overall loop is O(n) time complexity
+        moved = False
+        while True:
+            # move bottom_left clockwise while its neighbour is below the tangent line
+            candidate = (bottom_left + 1) % len(left)
+            turn = orientation(left[bottom_left], right[bottom_right], left[candidate])
+            if turn < 0 or (turn == 0 and left[candidate] < left[bottom_left]):
+                bottom_left = candidate
+                moved = True
+            else:
+                break
+        while True:
+            # move bottom_right counterclockwise while its neighbour is below the tangent line
+            candidate = (bottom_right - 1) % len(right)
+            turn = orientation(left[bottom_left], right[bottom_right], right[candidate])
+            if turn < 0 or (turn == 0 and right[candidate] > right[bottom_right]):
+                bottom_right = candidate
+                moved = True
+            else:
+                break
+
+    # Merge hulls on tangent lines. Going clockwise from left[0] (which is always kept), the
+    # merged hull is left up to upper_left, right from upper_right round to bottom_right, and
+    # left from bottom_left back to the start. bottom_left == 0 means that last part is empty.
+    if upper_right <= bottom_right:
+        right_part = right[upper_right:bottom_right + 1]
+    else:
+        right_part = right[upper_right:] + right[:bottom_right + 1]
+    if bottom_left == 0:
+        return left[:upper_left + 1] + right_part
+    return left[:upper_left + 1] + right_part + left[bottom_left:]
+
+
+def divide_and_conquer(points):
+    """
+    Hull of distinct points sorted by (x, y), as sort_points() returns them.
+
+    Complexity analysis with respect to n (the number of points)
+    
+    Time complexity: O(nlogn)
+        General form of recurrence relation is T(n) = aT(n/b) + O(n^d)
+        We have a = 2, b = 2, and d = 1 = complexity of merge_hulls()
+        Therefore, time complexity is T(n) = O(nlogn) by Master Theorem
+    
+    Space complexity: O(n)
+        Prior to recursive call, space complexity is O(n) to just store the points
+        within recursive call, space complexity of merge_hulls() is O(n) to
+        store the points and hulls
+    """
+    if len(points) < 4:
+        assert(len(points) != 0)
+        assert(len(points) != 1)
+        hull = []
+        hull.append(points[0])
+        if len(points) == 3:
+            turn = orientation(points[0], points[1], points[2])
+            if turn < 0:
+                hull.append(points[1])
+                hull.append(points[2])
+            elif turn > 0:
+                hull.append(points[2])
+                hull.append(points[1])
+            else: # Collinear, so the middle point in (x, y) order is not a vertex
+                hull.append(points[2])
+            return hull
+        elif len(points) == 2:
+            hull.append(points[1])
+            return hull
+    mid = len(points) // 2
+    return merge_hulls(divide_and_conquer(points[:mid]), divide_and_conquer(points[mid:]))
+
+
+def _link_hull(points, cw, ccw, lo, hi):
+    """
+    divide_and_conquer() on the index range [lo, hi) of the shared (sorted) points list, with
+    no slicing. A hull is never stored as a list: cw[i] and ccw[i] are the indices of the
+    vertices after and before i going clockwise, so a merge only relinks the four tangent
+    endpoints. Since the points are sorted by (x, y), the first vertex of the range is lo and
+    the last is hi - 1.
+    """
+    if hi - lo < 4:
+        assert(hi - lo >= 2)
+        a, b, c = lo, lo + 1, hi - 1
+        turn = orientation(points[a], points[b], points[c]) if hi - lo == 3 else 0
+        if turn == 0: # Two points, or three collinear ones whose middle point is dropped
+            cw[a] = ccw[a] = c
+            cw[c] = ccw[c] = a
+            return
+        if turn > 0:
+            b, c = c, b # Same order as the 3-point base case of divide_and_conquer()
+        cw[a], cw[b], cw[c] = b, c, a
+        ccw[a], ccw[b], ccw[c] = c, a, b
+        return
+    mid = (lo + hi) // 2
+    _link_hull(points, cw, ccw, lo, mid)
+    _link_hull(points, cw, ccw, mid, hi)
+    _link_merge(points, cw, ccw, mid - 1, mid)
+
+
+def _link_merge(points, cw, ccw, left, right):
+    """
+    merge_hulls() on linked hulls, starting from the last vertex left of the left hull and
+    the first vertex right of the right hull. The tangents are walked with the same
+    orientation() tests, on indices.
+
+    Time complexity: O(n)
+    Space complexity: O(1)
+    """
+    # find upper tangent, moving counterclockwise on the left and clockwise on the right
+    upper_left, upper_right = left, right
+    moved = True
+    while moved:
+        moved = False
+        while True:
+            candidate = ccw[upper_left]
+            turn = orientation(points[upper_left], points[upper_right], points[candidate])
+            if not (turn > 0 or (turn == 0 and points[candidate] < points[upper_left])):
+                break
+            upper_left = candidate
+            moved = True
+        while True:
+            candidate = cw[upper_right]
+            turn = orientation(points[upper_left], points[upper_right], points[candidate])
+            if not (turn > 0 or (turn == 0 and points[candidate] > points[upper_right])):
+                break
+            upper_right = candidate
+            moved = True
+
+    # find lower tangent, moving clockwise on the left and counterclockwise on the right
+    bottom_left, bottom_right = left, right
+    moved = True
+    while moved:
+        moved = False
+        while True:
+            candidate = cw[bottom_left]
+            turn = orientation(points[bottom_left], points[bottom_right], points[candidate])
+            if not (turn < 0 or (turn == 0 and points[candidate] < points[bottom_left])):
+                break
+            bottom_left = candidate
+            moved = True
+        while True:
+            candidate = ccw[bottom_right]
+            turn = orientation(points[bottom_left], points[bottom_right], points[candidate])
+            if not (turn < 0 or (turn == 0 and points[candidate] > points[bottom_right])):
+                break
+            bottom_right = candidate
+            moved = True
+
+    # Splice on the tangent lines; the vertices cut off are simply no longer linked to
+    cw[upper_left], ccw[upper_right] = upper_right, upper_left
+    cw[bottom_right], ccw[bottom_left] = bottom_left, bottom_right
+
+
+def indexed_divide_and_conquer(points):
+    """
+    divide_and_conquer() for distinct points sorted by (x, y), without the per-level copying:
+    the recursion works on index ranges over the points list itself, and the hulls live in
+    two preallocated arrays of successor indices (see _link_hull()). The only list built is
+    the final hull.
+
+    Time complexity: O(nlogn), as for divide_and_conquer()
+    Space complexity: O(n) in total, allocated once up front, rather than O(n) per level
+    """
+    n = len(points)
+    assert(n >= 2)
+    cw = array(LINK_TYPECODE, bytes(LINK_SIZE * n))
+    ccw = array(LINK_TYPECODE, cw)
+    _link_hull(points, cw, ccw, 0, n)
+
+    hull = [points[0]]
+    i = cw[0]
+    while i != 0:
+        hull.append(points[i])
+        i = cw[i]
+    return hull
+
+
+def _pack(points):
+    """Flattens (x, y) tuples into a compact array of doubles, which pickles as raw bytes."""
+    packed = array('d')
+    for p in points:
+        packed.extend(p)
+    return packed
+
+
+def _unpack(packed):
+    return list(zip(packed[0::2], packed[1::2]))
+
+
+def _slab_hull(packed):
+    # Runs in a worker process, so it has to be a module-level function
+    return _pack(divide_and_conquer(_unpack(packed)))
+
+
+def parallel_divide_and_conquer(points, workers=None, pool=None):
+    """
+    Parallel version of divide_and_conquer() for points from sort_points(). The points are cut
+    into one contiguous slab per worker, the slab hulls are computed in a process pool (shipped
+    as packed arrays of doubles rather than lists of tuples), and then merged pairwise with
+    merge_hulls() in a log(P)-level reduction tree. An existing ProcessPoolExecutor (with
+    workers processes) can be passed as pool to avoid paying the pool startup on every call.
+
+    Time complexity: O((n/P)log(n/P)) per worker, plus O(n) to ship the points and O(n) for
+    the log(P) levels of merges in the worst case (O(h log P) for typical small hulls)
+    Space complexity: O(n)
+    """
+    workers = workers or os.cpu_count() or 1
+    slabs = min(workers, len(points) // 4)
+    if slabs < 2:
+        return divide_and_conquer(points)
+    bounds = [len(points) * i // slabs for i in range(slabs + 1)]
+    packed = [_pack(points[bounds[i]:bounds[i + 1]]) for i in range(slabs)]
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        hulls = [_unpack(hull) for hull in pool.map(_slab_hull, packed)]
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+    while len(hulls) > 1: # Each level halves the number of hulls, keeping them in x order
+        merged = [merge_hulls(hulls[i], hulls[i + 1]) for i in range(0, len(hulls) - 1, 2)]
+        if len(hulls) % 2 == 1:
+            merged.append(hulls[-1])
+        hulls = merged
+    return hulls[0]
+
+
+def compute_hull(points):
+    """
+    Returns the convex hull of points (anything accepted by as_points()) as a list of (x, y)
+    tuples in clockwise order, starting from the leftmost point (the lowest one, if several
+    share the smallest x). Repeated points and points with equal x values are fine.
+
+    Overall time complexity is O(nlogn) + O(nlogn) = O(nlogn)
+    Overall space complexity is O(n) + O(n) = O(n)
+    """
+    points = sort_points(as_points(points))
+    if len(points) < 2:
+        return points
+    return indexed_divide_and_conquer(points)
+
+
+def _mini_hull(points):
+    """Hull of an unsorted group of points, in clockwise order from the leftmost point."""
+    points = sort_points(points)
+    return points if len(points) < 2 else divide_and_conquer(points)
+
+
+def _walk_tangent(hull, t, p):
+    """
+    Walks clockwise around hull from index t to the vertex q for which no vertex of hull lies
+    to the left of p -> q, the same way merge_hulls() walks its tangents: keep stepping while
+    the next vertex improves the line. Collinear vertices are stepped over if they are farther
+    from p, so that points in the middle of a hull edge are never picked.
+    """
+    size = len(hull)
+    if hull[t % size] == p: # p is on this mini-hull, so its successor is the tangent
+        t += 1
+    while True:
+        q, r = hull[t % size], hull[(t + 1) % size]
+        turn = orientation(p, q, r)
+        if r != p and (turn > 0 or (turn == 0 and _dist2(p, r) > _dist2(p, q))):
+            t += 1
+        else:
+            return t % size
+
+
+def _dist2(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def chan(points):
+    """
+    Chan's output-sensitive hull algorithm. For guesses m = 2^(2^t) of the hull size, the
+    points are split into groups of m, the group hulls are built with divide_and_conquer(),
+    and a Jarvis march wraps around them for at most m steps, finding the next vertex on each
+    group hull with _walk_tangent(). The march starts each walk where the previous one for
+    that group ended, since those tangents only ever move clockwise. Returns the hull in the
+    same order as divide_and_conquer() without needing the input sorted.
+
+    Time complexity: O(nlogh), since guess t costs O(n 2^t) and the guesses stop once
+    2^(2^t) >= h
+    Space complexity: O(n)
+    """
+    points = as_points(points)
+    if len(points) < 3:
+        return _mini_hull(points)
+    start = min(points)
+    t = 1
+    while True:
+        m = min(2 ** (2 ** t), len(points))
+        hulls = [_mini_hull(points[i:i + m]) for i in range(0, len(points), m)]
+        tangents = [0] * len(hulls)
+        hull = [start]
+        for _ in range(m):
+            p = hull[-1]
+            best = None
+            for i, group_hull in enumerate(hulls):
+                tangents[i] = _walk_tangent(group_hull, tangents[i], p)
+                q = group_hull[tangents[i]]
+                if q == p:
+                    continue
+                if best is None:
+                    best = q
+                    continue
+                turn = orientation(p, best, q)
+                if turn > 0 or (turn == 0 and _dist2(p, q) > _dist2(p, best)):
+                    best = q
+            if best is None or best == start:
+                return hull
+            hull.append(best)
+        t += 1
+
+
+class _Chain:
+    """
+    Upper convex chain of the points inserted so far, kept left to right as a blocked sorted
+    list: a list of blocks of at most 2 * BLOCK_SIZE points, plus the largest x of each
+    block for bisection. A block shared with a snapshot is frozen and is copied before its
+    first modification, so taking a snapshot only costs one flag per block.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.maxes = []
+        self.frozen = []
+
+    def _locate(self, x):
+        """
+        Position (block, index) just after the last point with x-coordinate <= x.
+        """
+        b = bisect_right(self.maxes, x)
+        if b == len(self.blocks):
+            return (b - 1, len(self.blocks[b - 1])) if self.blocks else (0, 0)
+        return b, bisect_right(self.blocks[b], (x, math.inf))
+
+    def _prev(self, position):
+        b, i = position
+        if i > 0:
+            return b, i - 1
+        if b > 0:
+            return b - 1, len(self.blocks[b - 1]) - 1
+        return None
+
+    def _next(self, position):
+        b, i = position
+        if i + 1 < len(self.blocks[b]):
+            return b, i + 1
+        if b + 1 < len(self.blocks):
+            return b + 1, 0
+        return None
+
+    def _at(self, position):
+        return self.blocks[position[0]][position[1]] if position is not None else None
+
+    def _writable(self, b):
+        if self.frozen[b]:
+            self.blocks[b] = list(self.blocks[b])
+            self.frozen[b] = False
+        return self.blocks[b]
+
+    def _insert(self, position, point):
+        b, i = position
+        if not self.blocks:
+            self.blocks.append([point])
+            self.maxes.append(point[0])
+            self.frozen.append(False)
+            return
+        block = self._writable(b)
+        block.insert(i, point)
+        self.maxes[b] = block[-1][0]
+        if len(block) > 2 * BLOCK_SIZE:
+            self.blocks[b:b + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self.maxes[b:b + 1] = [block[BLOCK_SIZE - 1][0], block[-1][0]]
+            self.frozen[b:b + 1] = [False, False]
+
+    def _pop(self, position):
+        b, i = position
+        block = self._writable(b)
+        del block[i]
+        if block:
+            self.maxes[b] = block[-1][0]
+        else:
+            del self.blocks[b], self.maxes[b], self.frozen[b]
+
+    def insert(self, p):
+        """
+        Adds p to the chain if it lies strictly above it, then removes the neighbours on either
+        side that p makes non-convex. Returns True if the chain changed.
+
+        Time complexity: O(log n + BLOCK_SIZE) amortized, since every point is removed at most once
+        Space complexity: O(1) amortized
+        """
+        position = self._locate(p[0])
+        before = self._at(self._prev(position))
+        if before is not None and before[0] == p[0]: # Only the highest point of a vertical line can be on the chain
+            if before[1] >= p[1]:
+                return False
+            self._pop(self._prev(position))
+            position = self._locate(p[0])
+            before = self._at(self._prev(position))
+        after = self._at(position) if self.blocks and position[1] < len(self.blocks[position[0]]) else None
+        if before is not None and after is not None and orientation(before, after, p) <= 0:
+            return False # On or below the chain
+        self._insert(position, p)
+
+        while True: # Left neighbours
+            left = self._prev(self._prev(self._locate(p[0])))
+            farther = self._prev(left) if left is not None else None
+            if farther is None or orientation(self._at(farther), self._at(left), p) < 0:
+                break
+            self._pop(left)
+        while True: # Right neighbours
+            right = self._locate(p[0])
+            if right[1] == len(self.blocks[right[0]]):
+                break
+            farther = self._next(right)
+            if farther is None or orientation(p, self._at(right), self._at(farther)) < 0:
+                break
+            self._pop(right)
+        return True
+
+    def snapshot(self):
+        self.frozen = [True] * len(self.blocks)
+        return tuple(self.blocks)
+
+
+class HullSnapshot:
+    """
+    Read-only view of a DynamicHull at one point in time. It shares blocks with the live hull
+    instead of copying the points; later inserts copy any block they modify. Iterating yields
+    the hull in the same order as divide_and_conquer(): clockwise from the leftmost point.
+    """
+
+    def __init__(self, upper_blocks, lower_blocks):
+        self._upper = upper_blocks
+        self._lower = lower_blocks # Reflected through the x-axis
+
+    def __iter__(self):
+        if not self._upper:
+            return
+        # The lowest point of the leftmost vertical line comes first, as after a sort by (x, y)
+        lower_first = (self._lower[0][0][0], -self._lower[0][0][1])
+        if lower_first != self._upper[0][0]:
+            yield lower_first
+        for block in self._upper:
+            yield from block
+        upper_last = self._upper[-1][-1]
+        lower = ((x, -y) for block in reversed(self._lower) for x, y in reversed(block))
+        first = next(lower)
+        if first != upper_last and first != lower_first:
+            yield first
+        previous = None
+        for point in lower:
+            if previous is not None:
+                yield previous
+            previous = point
+        # previous is now lower_first, which has already been yielded
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class DynamicHull:
+    """
+    Convex hull that accepts points one at a time. The upper and lower hulls are kept as two
+    _Chains (the lower one reflected through the x-axis), so an insert only touches the
+    neighbourhood of the new point instead of re-sorting and re-merging everything.
+    """
+
+    def __init__(self, points=()):
+        self._upper = _Chain()
+        self._lower = _Chain()
+        for p in points:
+            self.insert(p)
+
+    def insert(self, point):
+        """
+        Adds point (an (x, y) pair), returning True if the hull changed.
+
+        Time complexity: O(log n + BLOCK_SIZE) amortized
+        Space complexity: O(1) amortized
+        """
+        x, y = point[0], point[1]
+        changed_upper = self._upper.insert((x, y))
+        changed_lower = self._lower.insert((x, -y))
+        return changed_upper or changed_lower
+
+    def hull(self):
+        """
+        Returns a HullSnapshot of the current hull.
+
+        Time complexity: O(h / BLOCK_SIZE)
+        Space complexity: O(h / BLOCK_SIZE)
+        """
+        return HullSnapshot(self._upper.snapshot(), self._lower.snapshot())
@@ -0,0 +1,133 @@
+"""convex_hull_numpy.py: Vectorized convex hull backend.
+
+Andrew's monotone chain on an (n, 2) float array, with the sort, the orientation tests and
+most of the chain building done in bulk by NumPy instead of one point at a time.
+"""
+
+import numpy as np
+
+# Once a bulk pass removes less than this fraction of a chain, the few remaining concave
+# vertices are cheaper to clean up with the ordinary sequential scan
+MIN_PASS_YIELD = 0.125
+
+
+def as_array(points):
+    """
+    Converts points to a float (n, 2) array. Accepts anything convex_hull_core.as_points()
+    does.
+    """
+    if isinstance(points, np.ndarray):
+        return points.reshape(-1, 2).astype(float, copy=False)
+    points = list(points)
+    if points and callable(getattr(points[0], 'x', None)):
+        return np.array([(p.x(), p.y()) for p in points], dtype=float).reshape(-1, 2)
+    return np.array(points, dtype=float).reshape(-1, 2)
+
+
+def cross(o, a, b):
+    """
+    Cross product (a - o) x (b - o) for arrays of points, broadcasting over leading axes.
+    Positive when o -> a -> b turns counterclockwise.
+    """
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def akl_toussaint_filter(points):
+    """
+    Akl-Toussaint heuristic: finds the extreme points of an (n, 2) array in the eight
+    directions of the axes and diagonals, and drops every point strictly inside the polygon
+    they form, since none of those can be on the hull. Returns the surviving points, in their
+    original order.
+
+    On a uniform disc the octagon covers most of the disc, so nearly every point is removed
+    before any sorting happens.
+
+    Time complexity: O(n)
+    Space complexity: O(n)
+    """
+    points = as_array(points)
+    if len(points) < 3:
+        return points
+    x, y = points[:, 0], points[:, 1]
+    # Counterclockwise from the leftmost point: W, SW, S, SE, E, NE, N, NW
+    extremes = [np.argmin(x), np.argmin(x + y), np.argmin(y), np.argmax(x - y),
+                np.argmax(x), np.argmax(x + y), np.argmax(y), np.argmin(x - y)]
+    polygon = []
+    for p in points[extremes]:
+        if not polygon or np.any(p != polygon[-1]):
+            polygon.append(p)
+    if len(polygon) > 1 and np.all(polygon[0] == polygon[-1]):
+        polygon.pop()
+    if len(polygon) < 3:
+        return points
+    inside = np.ones(len(points), dtype=bool)
+    for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+        inside &= cross(a, b, points) > 0 # Strictly left of every counterclockwise edge
+    return points[~inside]
+
+
+def _sequential_chain(chain):
+    """
+    The classic one-point-at-a-time monotone chain scan, keeping only clockwise turns.
+
+    Time complexity: O(k) for a chain of k points
+    Space complexity: O(k)
+    """
+    hull = []
+    for p in chain.tolist():
+        while len(hull) >= 2 and ((hull[-1][0] - hull[-2][0]) * (p[1] - hull[-2][1]) -
+                                  (hull[-1][1] - hull[-2][1]) * (p[0] - hull[-2][0])) >= 0:
+            hull.pop()
+        hull.append(p)
+    return np.array(hull, dtype=float)
+
+
+def _upper_chain(points):
+    """
+    Upper hull of x-sorted points, from the first point to the last.
+
+    Every point on or below the line between the two endpoints is dropped in one pass. After
+    that, each pass drops every vertex that doesn't make a strict clockwise turn with its
+    neighbours. Such a vertex lies on or below the segment joining two other points of the
+    chain, so it can't be a hull vertex, and all of them can be dropped at once.
+
+    Time complexity: O(n) per pass, with few passes on typical inputs
+    Space complexity: O(n)
+    """
+    first, last = points[0], points[-1]
+    above = cross(first, last, points[1:-1]) > 0
+    chain = np.concatenate([points[:1], points[1:-1][above], points[-1:]])
+    while len(chain) > 2:
+        convex = cross(chain[:-2], chain[1:-1], chain[2:]) < 0
+        removed = len(convex) - np.count_nonzero(convex)
+        if removed == 0:
+            return chain
+        keep = np.concatenate([[True], convex, [True]])
+        chain = chain[keep]
+        if removed < MIN_PASS_YIELD * len(keep):
+            return _sequential_chain(chain)
+    return chain
+
+
+def monotone_chain(points):
+    """
+    Returns the convex hull of points (an (n, 2) array, or anything as_array() accepts) as an
+    (h, 2) array in clockwise order starting from the leftmost point, like
+    convex_hull_core.divide_and_conquer(). Collinear points on the hull are left out.
+
+    Time complexity: O(nlogn) for the sort, then O(n) per bulk pass
+    Space complexity: O(n)
+    """
+    points = as_array(points)
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    points = points[order]
+    if len(points) > 1:
+        # Drop repeated points, since two copies of a vertex would each look collinear to the other
+        distinct = np.concatenate([[True], np.any(points[1:] != points[:-1], axis=1)])
+        points = points[distinct]
+    if len(points) < 3:
+        return points
+    upper = _upper_chain(points)
+    # The lower hull is the upper hull of the point set reflected through the x-axis
+    lower = _upper_chain(points * np.array([1.0, -1.0])) * np.array([1.0, -1.0])
+    return np.concatenate([upper, lower[-2:0:-1]])
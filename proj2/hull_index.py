@@ -0,0 +1,176 @@
+"""hull_index.py: Logarithmic-time queries on a finished convex hull.
+
+HullIndex wraps the output of convex_hull_core.divide_and_conquer() (or compute_hull()) and
+answers containment, extreme-point and tangent queries by binary search instead of walking
+the whole polygon.
+"""
+
+import numpy as np
+
+from convex_hull_core import compute_hull, orientation
+
+
+def _first(lo, hi, pred):
+    """Smallest i in [lo, hi) with pred(i) true, or hi, for pred false...false true...true."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pred(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class HullIndex:
+    """
+    Query index over a convex hull given as (x, y) tuples in clockwise order from the leftmost
+    point, as divide_and_conquer() returns it. Building it is O(h); every query is O(log h).
+
+    Containment uses the fan of triangles from the first vertex: a binary search over the fan
+    finds the wedge a point falls in, and one orientation() test against the wedge's hull edge
+    settles it. Extreme points split the hull at its first and last vertex in (x, y) order
+    into an upper and a lower chain, on each of which the edge directions turn monotonically.
+    """
+
+    def __init__(self, hull):
+        self.hull = [(p[0], p[1]) for p in hull]
+        assert(len(self.hull) != 0)
+        # Counterclockwise from the same first vertex, for the fan
+        self._ccw = self.hull[:1] + self.hull[:0:-1]
+        # The upper chain runs clockwise from hull[0] to the last vertex in (x, y) order, and
+        # the lower chain from there back round to hull[0]
+        self._last = max(range(len(self.hull)), key=lambda i: self.hull[i])
+        self._array = None
+
+    @classmethod
+    def from_points(cls, points):
+        return cls(compute_hull(points))
+
+    def __len__(self):
+        return len(self.hull)
+
+    def __contains__(self, point):
+        """
+        True if point is inside the hull or on its boundary.
+
+        Time complexity: O(log h)
+        Space complexity: O(1)
+        """
+        v = self._ccw
+        q = (point[0], point[1])
+        if len(v) < 3:
+            return self._on_degenerate(q)
+        # Outside the angle the fan spans at v[0]
+        if orientation(v[0], v[1], q) < 0 or orientation(v[0], v[-1], q) > 0:
+            return False
+        # Last fan diagonal v[0] -> v[i] with q on or to its left; q is then in wedge (v[i], v[i + 1])
+        i = _first(1, len(v) - 1, lambda j: orientation(v[0], v[j], q) < 0) - 1
+        i = min(i, len(v) - 2)
+        return orientation(v[i], v[i + 1], q) >= 0
+
+    def contains(self, points):
+        """
+        Vectorized containment for an (n, 2) array of points: returns a boolean array, True for
+        points inside the hull or on its boundary. The wedge of each point is found by its angle
+        around the first vertex with np.searchsorted(), then one cross product per point against
+        the wedge's hull edge decides it. Unlike `in`, points within rounding error of a fan
+        diagonal or of the boundary may come out either way.
+
+        Time complexity: O(n log h)
+        Space complexity: O(n)
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(self._ccw) < 3:
+            return np.array([self._on_degenerate((x, y)) for x, y in points.tolist()], dtype=bool)
+        if self._array is None:
+            v = np.array(self._ccw, dtype=float)
+            # Every other vertex comes after v[0] in (x, y) order, so these angles lie in
+            # (-pi/2, pi/2] and increase counterclockwise
+            self._array = v, np.arctan2(v[1:, 1] - v[0, 1], v[1:, 0] - v[0, 0])
+        v, angles = self._array
+        dx, dy = points[:, 0] - v[0, 0], points[:, 1] - v[0, 1]
+        query = np.arctan2(dy, dx)
+        wedge = np.clip(np.searchsorted(angles, query, side='right'), 1, len(v) - 2)
+        a, b = v[wedge], v[wedge + 1]
+        edge = (b[:, 0] - a[:, 0]) * (points[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (points[:, 0] - a[:, 0])
+        in_fan = (query >= angles[0]) & (query <= angles[-1])
+        return (in_fan & (edge >= 0)) | ((dx == 0) & (dy == 0))
+
+    def extreme(self, direction):
+        """
+        A hull vertex maximizing the dot product with direction (dx, dy).
+
+        Directions pointing up (or straight left) are extreme on the upper chain, the others on
+        the lower chain. Along a chain the edges turn clockwise, so their dot products with the
+        direction are positive up to some edge and at most zero from then on; the extreme vertex
+        is the start of the first edge with a dot product <= 0.
+
+        Time complexity: O(log h)
+        Space complexity: O(1)
+        """
+        dx, dy = direction
+        hull, n = self.hull, len(self.hull)
+
+        def falls(i):
+            a, b = hull[i % n], hull[(i + 1) % n]
+            return (b[0] - a[0]) * dx + (b[1] - a[1]) * dy <= 0
+
+        if dy > 0 or (dy == 0 and dx < 0):
+            return hull[_first(0, self._last, falls)]
+        return hull[_first(self._last, n, falls) % n]
+
+    def tangents(self, point):
+        """
+        The two hull vertices (a, b) where the lines from point outside the hull touch it: the
+        hull lies on or to the right of point -> a, and on or to the left of point -> b.
+
+        An edge faces point if point is to its right. The facing edges are contiguous, and the
+        tangents are the two vertices where facing changes. If the line from point through the
+        first vertex v0 cuts through the hull, it splits the boundary into two arcs (found by a
+        binary search on which side of the line each vertex is), and each arc has one change,
+        found by a second binary search. Otherwise the line touches the hull at v0 or along an
+        edge next to it, so one change is at v0 or a neighbour, and the other can be searched
+        for over the remaining edges.
+
+        Raises ValueError if point is inside the hull or on its boundary.
+
+        Time complexity: O(log h)
+        Space complexity: O(1)
+        """
+        p = (point[0], point[1])
+        if p in self:
+            raise ValueError('{} is not outside the hull'.format(p))
+        v, n = self._ccw, len(self._ccw)
+        if n < 3:
+            a, b = v[0], v[-1]
+        else:
+            def faces(i):
+                # p on the edge's line counts as facing it, as it would if p were nudged away from
+                # the hull, so that the facing edges stay contiguous when p lines up with an edge
+                return orientation(v[i], v[(i + 1) % n], p) <= 0
+
+            first, last = orientation(p, v[0], v[1]), orientation(p, v[0], v[-1])
+            if (first > 0 and last < 0) or (first < 0 and last > 0):
+                k = _first(1, n, lambda i: (orientation(p, v[0], v[i]) > 0) != (first > 0)) - 1
+                facing = faces(0)
+                t1 = _first(1, k + 1, lambda i: faces(i) != facing)
+                facing = faces(k)
+                t2 = _first(k + 1, n, lambda i: faces(i) != facing)
+            else:
+                changes = [i for i in (0, 1, n - 1) if faces(i - 1) != faces(i)]
+                facing = faces(1)
+                t = _first(2, n - 1, lambda i: faces(i) != facing)
+                if t < n - 1:
+                    changes.append(t)
+                assert(len(changes) == 2)
+                t1, t2 = changes
+            a, b = v[t1], v[t2]
+        if orientation(p, a, b) > 0:
+            a, b = b, a
+        return a, b
+
+    def _on_degenerate(self, q):
+        """Containment for a hull of one or two points: q has to be on the point or segment."""
+        a, b = self.hull[0], self.hull[-1]
+        return (orientation(a, b, q) == 0 and min(a[0], b[0]) <= q[0] <= max(a[0], b[0])
+                and min(a[1], b[1]) <= q[1] <= max(a[1], b[1]))
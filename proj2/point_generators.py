@@ -0,0 +1,123 @@
+"""point_generators.py: Vectorized random point sets for the benchmarks and GUIs.
+
+Every generator takes the number of points and a seeded np.random.Generator and returns an
+(n, 2) float array, drawing the points in bulk rather than one random.uniform() call at a
+time. QPointFSequence presents such an array as a sequence of QPointF for the GUI code without
+building all the QPointF objects up front.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# Radius the GUI generators keep their points within
+MAX_R = 0.98
+
+
+def uniform_disc(n, rng, radius=MAX_R):
+    """Uniform in the disc of the given radius about the origin (sqrt of a uniform radius)."""
+    r = radius * np.sqrt(rng.random(n))
+    theta = rng.uniform(0.0, 2.0 * np.pi, n)
+    return np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+
+
+def uniform_rectangle(n, rng, x_range=(-1.0, 1.0), y_range=(-1.0, 1.0)):
+    """Uniform in the rectangle x_range x y_range; the default is the square [-1, 1]^2."""
+    return np.column_stack((rng.uniform(x_range[0], x_range[1], n), rng.uniform(y_range[0], y_range[1], n)))
+
+
+def _rejection_sample(n, rng, draw):
+    """
+    Collects n points from draw(m), which returns m candidates of which only some are accepted,
+    drawing in batches sized from the acceptance rate seen so far.
+    """
+    batches = []
+    count = 0
+    accepted_rate = 0.5
+    while count < n:
+        m = max(int((n - count) / accepted_rate * 1.1), 16)
+        batch = draw(m)
+        accepted_rate = max(len(batch) / m, 0.01)
+        batches.append(batch)
+        count += len(batch)
+    return np.concatenate(batches)[:n]
+
+
+def gaussian(n, rng, sigma=0.25, radius=MAX_R):
+    """Gaussian about the origin with standard deviation sigma, cut off at radius."""
+    def draw(m):
+        points = rng.normal(0.0, sigma, (m, 2))
+        return points[np.einsum('ij,ij->i', points, points) <= radius ** 2]
+    return _rejection_sample(n, rng, draw)
+
+
+def spherical(n, rng, radius=MAX_R):
+    """The (x, y) coordinates of points uniform in the ball of the given radius, like the GUI's."""
+    def draw(m):
+        points = rng.uniform(-1.0, 1.0, (m, 3))
+        return points[np.einsum('ij,ij->i', points, points) <= radius ** 2][:, :2]
+    return _rejection_sample(n, rng, draw)
+
+
+def on_circle(n, rng, radius=MAX_R):
+    """On the circle of the given radius, so every point is a hull vertex (h = n)."""
+    theta = rng.uniform(0.0, 2.0 * np.pi, n)
+    return np.column_stack((radius * np.cos(theta), radius * np.sin(theta)))
+
+
+# Generators by name, for command line options and benchmark labels
+DISTRIBUTIONS = {
+    'uniform_disc': uniform_disc,
+    'uniform_square': uniform_rectangle,
+    'gaussian': gaussian,
+    'spherical': spherical,
+    'on_circle': on_circle,
+}
+
+
+def generate(distribution, n, seed=None, **kwargs):
+    """n points from DISTRIBUTIONS[distribution], with a Generator seeded by seed."""
+    return DISTRIBUTIONS[distribution](n, np.random.default_rng(seed), **kwargs)
+
+
+def _qpointf():
+    # Imported on first use, so the generators themselves work without PyQt installed
+    from which_pyqt import PYQT_VER
+    if PYQT_VER == 'PYQT5':
+        from PyQt5.QtCore import QPointF
+    elif PYQT_VER == 'PYQT4':
+        from PyQt4.QtCore import QPointF
+    elif PYQT_VER == 'PYQT6':
+        from PyQt6.QtCore import QPointF
+    else:
+        raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+    return QPointF
+
+
+class QPointFSequence(Sequence):
+    """
+    Read-only sequence of QPointF over an (n, 2) array, creating each QPointF when it is
+    accessed. tolist() returns the (x, y) pairs themselves, so convex_hull_core.as_points() can
+    read the coordinates without going through QPointF at all.
+    """
+
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=float).reshape(-1, 2)
+        self._QPointF = _qpointf()
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QPointFSequence(self.array[index])
+        x, y = self.array[index]
+        return self._QPointF(float(x), float(y))
+
+    def __iter__(self):
+        QPointF = self._QPointF
+        for x, y in self.array.tolist():
+            yield QPointF(x, y)
+
+    def tolist(self):
+        return self.array.tolist()
@@ -0,0 +1,69 @@
+"""streaming_hull.py: Convex hull of point files too large to load at once.
+
+The points are read a chunk at a time, from a memory-mapped binary file of float64 (x, y)
+pairs or from a CSV file, and only the running hull is kept between chunks.
+"""
+
+import itertools
+import os
+
+import numpy as np
+
+from convex_hull_core import compute_hull
+
+# Points per chunk; a chunk of (x, y) tuples takes roughly 100 bytes per point
+CHUNK_SIZE = 1 << 20
+
+
+def write_points(path, points):
+    """
+    Writes points (an (n, 2) array or anything np.asarray() takes) as raw float64 pairs to path,
+    which can also be a file opened in binary mode to append several batches.
+    """
+    np.asarray(points, dtype=np.float64).reshape(-1, 2).tofile(path)
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE, header=False):
+    """
+    Yields the points in path as (k, 2) float arrays of at most chunk_size points. Files ending
+    in .csv are parsed as x,y lines (skipping the first line if header is set), chunk_size
+    lines at a time; anything else is memory-mapped as raw float64 (x, y) pairs, so only the
+    pages of the current chunk are ever resident.
+    """
+    if path.endswith('.csv'):
+        with open(path) as f:
+            if header:
+                next(f, None)
+            while True:
+                lines = list(itertools.islice(f, chunk_size))
+                if not lines:
+                    return
+                yield np.loadtxt(lines, delimiter=',', ndmin=2)[:, :2]
+    else:
+        if os.path.getsize(path) == 0:
+            return
+        points = np.memmap(path, dtype=np.float64, mode='r').reshape(-1, 2)
+        for lo in range(0, len(points), chunk_size):
+            yield points[lo:lo + chunk_size]
+
+
+def streaming_hull(path, chunk_size=CHUNK_SIZE, header=False):
+    """
+    Convex hull of the points in path (see read_chunks() for the formats), in the same order as
+    compute_hull(). Returns (hull, n) where n is the number of points read.
+
+    Each chunk's hull is computed with compute_hull(), and then merged into the running hull
+    by running compute_hull() again on the vertices of the two, so the divide and conquer's
+    tangent merges do the merging. The running hull and chunk hull overlap anywhere in the
+    plane, so they can't be merged by their tangents directly the way two x-separated halves
+    can.
+
+    Time complexity: O(n log c) for chunks of c points, plus O(h log h) per chunk for the merges
+    Space complexity: O(c + h)
+    """
+    hull = []
+    n = 0
+    for chunk in read_chunks(path, chunk_size, header):
+        n += len(chunk)
+        hull = compute_hull(hull + compute_hull(chunk))
+    return hull, n
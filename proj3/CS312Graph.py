@@ -1,7 +1,38 @@
 #!/usr/bin/python3
 
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, chain
+
+# Typecodes for the compressed sparse row (CSR) arrays: node ids, and offsets into the edge arrays
+NODE_TYPECODE = 'i'
+OFFSET_TYPECODE = 'q'
+LENGTH_TYPECODE = 'q' # Edge lengths of an integer_weights graph
+
+_QPointF = None
+
+
+def _qpointf():
+    # Imported on first use, so graphs can be built and searched without PyQt installed
+    global _QPointF
+    if _QPointF is None:
+        from which_pyqt import PYQT_VER
+        if PYQT_VER == 'PYQT5':
+            from PyQt5.QtCore import QPointF
+        elif PYQT_VER == 'PYQT4':
+            from PyQt4.QtCore import QPointF
+        elif PYQT_VER == 'PYQT6':
+            from PyQt6.QtCore import QPointF
+        else:
+            raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+        _QPointF = QPointF
+    return _QPointF
+
 
 class CS312GraphEdge:
+    # Created on demand from the graph's edge arrays, so it holds just the three fields
+    __slots__ = ('src', 'dest', 'length')
+
     def __init__( self, src_node, dest_node, edge_length ):
         self.src   = src_node
         self.dest  = dest_node
@@ -14,30 +45,125 @@ class CS312GraphEdge:
         return '(src={} dest={} length={})'.format(self.src,self.dest,self.length)
 
 class CS312GraphNode:
-    def __init__( self, node_id, node_loc ):
+    """
+    View of node node_id in graph. Views are created on access and compare (and hash) equal
+    when they are the same node of the same graph, so they still work as dict keys.
+    """
+    __slots__ = ('graph', 'node_id')
+
+    def __init__( self, graph, node_id ):
+        self.graph     = graph
         self.node_id   = node_id
-        self.loc       = node_loc
-        self.neighbors = [] #node_neighbors
 
-    def addEdge( self, neighborNode, weight ):
-        self.neighbors.append( CS312GraphEdge(self,neighborNode,weight) )
+    @property
+    def loc( self ):
+        return self.graph.getLoc(self.node_id)
+
+    @property
+    def neighbors( self ):
+        """The out-edges, built from the graph's edge arrays."""
+        graph = self.graph
+        start, end = graph.offsets[self.node_id], graph.offsets[self.node_id + 1]
+        return [CS312GraphEdge(self, CS312GraphNode(graph, dest), length)
+                for dest, length in zip(graph.dest[start:end], graph.length[start:end])]
+
+    def __eq__( self, other ):
+        return (isinstance(other, CS312GraphNode) and self.node_id == other.node_id
+                and self.graph is other.graph)
+
+    def __hash__( self ):
+        return hash(self.node_id)
 
     def __str__( self ):
         neighbors = [edge.dest.node_id for edge in self.neighbors]
         return 'Node(id:{},neighbors:{})'.format(self.node_id,neighbors)
 
 
+class _NodeSequence(Sequence):
+    """graph.nodes: a sequence of CS312GraphNode views, created as they are accessed."""
+
+    def __init__( self, graph ):
+        self.graph = graph
+
+    def __len__( self ):
+        return len(self.graph.offsets) - 1
+
+    def __getitem__( self, index ):
+        if isinstance(index, slice):
+            return [CS312GraphNode(self.graph, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('node index out of range')
+        return CS312GraphNode(self.graph, index)
+
+    def __iter__( self ):
+        graph = self.graph
+        for i in range(len(self)):
+            yield CS312GraphNode(graph, i)
+
+
 class CS312Graph:
-    def __init__( self, nodeList, edgeList ):
-        self.nodes    = []
-        for i in range(len(nodeList)):
-            self.nodes.append( CS312GraphNode( i, nodeList[i] ) )
-
-        for i in range(len(nodeList)):
-            neighbors = edgeList[i]
-            for n in neighbors:
-                self.nodes[i].addEdge( self.nodes[n[0]], n[1] )
-        
+    """
+    Directed graph in compressed sparse row form. The out-edges of node i are entries
+    offsets[i] to offsets[i+1]-1 of the parallel arrays dest (the neighbour's node id) and
+    length, and the node coordinates are in the float arrays x and y. Nodes and edges are
+    views created from these arrays on access, so a graph takes about 12 bytes per edge and
+    24 per node instead of an object per node and per edge. No reference to nodeList (QPointF
+    objects, or a point_generators.QPointFSequence) is kept; node.loc builds a QPointF from x
+    and y when the GUI asks for it.
+
+    With integer_weights, edge lengths are rounded to the nearest integer as they are loaded
+    (the GUI already shows them rounded) and length is an integer array, so path lengths are
+    exact integers and integer-keyed queues such as NetworkRoutingSolver.PQ_Dial can be used.
+    """
+    def __init__( self, nodeList, edgeList, integer_weights=False ):
+        self.integer_weights = integer_weights
+        if hasattr(nodeList, 'array'): # A QPointFSequence: read its (n, 2) array a column at a time
+            self.x    = array('d', nodeList.array[:, 0].tolist())
+            self.y    = array('d', nodeList.array[:, 1].tolist())
+        else:
+            self.x    = array('d', [p.x() for p in nodeList])
+            self.y    = array('d', [p.y() for p in nodeList])
+
+        adjacency = [edgeList[i] for i in range(len(nodeList))]
+        self.offsets  = array(OFFSET_TYPECODE, chain((0,), accumulate(map(len, adjacency))))
+        self.dest     = array(NODE_TYPECODE, [n[0] for n in chain.from_iterable(adjacency)])
+        if integer_weights:
+            self.length = array(LENGTH_TYPECODE, [round(n[1]) for n in chain.from_iterable(adjacency)])
+        else:
+            self.length = array('d', [n[1] for n in chain.from_iterable(adjacency)])
+        self.nodes    = _NodeSequence(self)
+        self.in_offsets = None # Incoming edges, in the same form, once buildIncomingEdges() runs
+
+    def buildIncomingEdges( self ):
+        """
+        Builds the reverse adjacency, for searches that run backwards from a target: the edges
+        into node i are entries in_offsets[i] to in_offsets[i+1]-1 of the parallel arrays in_src
+        (the node each edge leaves) and in_length. Only built once; later calls return at once.
+
+        Time Complexity: O(|V| + |E|), a counting sort of the edges by destination
+        Space Complexity: O(|V| + |E|)
+        """
+        if self.in_offsets is not None:
+            return
+        offsets, dest, length = self.offsets, self.dest, self.length
+        counts = [0] * (len(offsets) - 1)
+        for v in dest:
+            counts[v] += 1
+        in_offsets = array(OFFSET_TYPECODE, chain((0,), accumulate(counts)))
+        in_src = array(NODE_TYPECODE, [0]) * len(dest)
+        in_length = array(length.typecode, [0]) * len(dest)
+        fill = in_offsets.tolist() # Next free slot of each node's incoming edges
+        for u in range(len(offsets) - 1):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = dest[k]
+                j = fill[v]
+                fill[v] = j + 1
+                in_src[j] = u
+                in_length[j] = length[k]
+        self.in_offsets, self.in_src, self.in_length = in_offsets, in_src, in_length
+
     def __str__( self ):
         s = []
         for n in self.nodes:
@@ -47,3 +173,6 @@ class CS312Graph:
     def getNodes( self ):
         return self.nodes
 
+    def getLoc( self, node_id ):
+        """The location of node node_id as a QPointF, created on each call."""
+        return _qpointf()(self.x[node_id], self.y[node_id])
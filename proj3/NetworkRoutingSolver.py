@@ -2,10 +2,25 @@
 
 
 from CS312Graph import *
+from array import array
+import functools
+import heapq
 import time
 import math
 
+# Marks a node with no predecessor in the indexed prev array
+NO_NODE = -1
+
 class PQInterface:
+    # True for queues that only hold the nodes with finite keys (see PQ_LazyHeap)
+    sparse = False
+    # True for queues that need integer keys, and so an integer_weights graph (see PQ_Dial)
+    integer_keys = False
+    # The array-backed queues hold node ids 0 to capacity-1; nodes that aren't ints are kept
+    # here by id, so they can be handed back, once one is seen
+    capacity = 0
+    nodes = None
+
     def __init__(self):
         self.queue = None
     
@@ -24,10 +39,30 @@ class PQInterface:
     def __len__(self):
         return len(self.queue)
 
+    def _id(self, node):
+        """
+        The id of node in the array-backed queues: node itself if it is an int, and otherwise
+        its node_id.
+        """
+        if isinstance(node, int):
+            return node
+        if self.nodes is None:
+            self.nodes = [None] * self.capacity
+        self.nodes[node.node_id] = node
+        return node.node_id
+
+    def _node(self, node_id):
+        """The node _id() mapped to node_id."""
+        return node_id if self.nodes is None else self.nodes[node_id]
+
 class PQ_Heap(PQInterface):
-    def __init__(self):
+    def __init__(self, capacity=None):
+        """
+        With capacity, the nodes are the integers 0 to capacity-1 and their positions are kept in a
+        preallocated list instead of a dict, so no node has to be hashed.
+        """
         self.queue = []
-        self.node_to_index = {}
+        self.node_to_index = {} if capacity is None else [0] * capacity
 
     def insert(self, item):
         """ 
@@ -117,10 +152,477 @@ class PQ_Heap(PQInterface):
         self.node_to_index[self.queue[index1][2]] = index1
         self.node_to_index[self.queue[index2][2]] = index2
 
+class PQ_FlatHeap(PQInterface):
+    """
+    Binary heap over flat arrays, for up to capacity nodes with ids 0 to capacity-1 (see
+    PQInterface._id()). keys[j] and ids[j] hold the entry in heap slot j, and position[id] is
+    the slot of node id. The sifts are loops that move entries into a hole instead of swapping
+    pairs, so each level costs one key comparison and one position update, with no tuples
+    compared and no dict touched.
+    (PQ_DaryHeap generalizes the sifts to d children per slot.)
+
+    Items are (key, i, node) triples as for PQ_Heap. delete_min() returns (key, id, node), so i
+    should be the node's id, as it is in computeShortestPaths(). Equal keys come out in no
+    particular order.
+    """
+    d = 2 # Children per slot
+
+    def __init__(self, capacity):
+        self.keys = array('d', [0.0]) * capacity
+        self.ids = array(NODE_TYPECODE, [0]) * capacity
+        self.position = array(NODE_TYPECODE, [0]) * capacity
+        self.capacity = capacity
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, item):
+        """
+        Time Complexity: O(log(|V|)) for the sift up.
+        Space Complexity: O(1) since the arrays are preallocated.
+        """
+        self.size += 1
+        self._siftUp(self.size - 1, item[0], self._id(item[2]))
+
+    def decrease_key(self, node, new_key):
+        """
+        Time Complexity: O(log(|V|)) for the sift up.
+        Space Complexity: O(1)
+        """
+        node_id = self._id(node)
+        self._siftUp(self.position[node_id], new_key, node_id)
+
+    def delete_min(self):
+        """
+        Time Complexity: O(log(|V|)) for the sift down.
+        Space Complexity: O(1)
+        """
+        key, node_id = self.keys[0], self.ids[0]
+        self.size -= 1
+        if self.size > 0:
+            self._siftDown(0, self.keys[self.size], self.ids[self.size])
+        return (key, node_id, self._node(node_id))
+
+    def make_queue(self, iterable):
+        """
+        Time Complexity: O(|V|): the items are copied into the arrays and then heapified bottom
+        up, sifting down from the last parent to the root.
+        Space Complexity: O(1) beyond the preallocated arrays.
+        """
+        keys, ids, position = self.keys, self.ids, self.position
+        size = self.size
+        for item in iterable:
+            node_id = self._id(item[2])
+            keys[size] = item[0]
+            ids[size] = node_id
+            position[node_id] = size
+            size += 1
+        self.size = size
+        for j in range((size - 2) // self.d, -1, -1):
+            self._siftDown(j, keys[j], ids[j])
+
+    def _siftUp(self, hole, key, node_id):
+        """
+        Puts (key, node_id) into the heap at slot hole or above it: parents with larger keys
+        move down into the hole until the key's slot is found.
+
+        Time Complexity: O(log(|V|))
+        Space Complexity: O(1)
+        """
+        keys, ids, position = self.keys, self.ids, self.position
+        while hole > 0:
+            parent = (hole - 1) >> 1
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            keys[hole] = parent_key
+            parent_id = ids[parent]
+            ids[hole] = parent_id
+            position[parent_id] = hole
+            hole = parent
+        keys[hole] = key
+        ids[hole] = node_id
+        position[node_id] = hole
+
+    def _siftDown(self, hole, key, node_id):
+        """
+        Puts (key, node_id) into the heap at slot hole or below it: the smaller child moves up
+        into the hole while its key is smaller.
+
+        Time Complexity: O(log(|V|))
+        Space Complexity: O(1)
+        """
+        keys, ids, position = self.keys, self.ids, self.position
+        size = self.size
+        child = 2 * hole + 1
+        while child < size:
+            child_key = keys[child]
+            right = child + 1
+            if right < size and keys[right] < child_key:
+                child = right
+                child_key = keys[right]
+            if key <= child_key:
+                break
+            keys[hole] = child_key
+            child_id = ids[child]
+            ids[hole] = child_id
+            position[child_id] = hole
+            hole = child
+            child = 2 * hole + 1
+        keys[hole] = key
+        ids[hole] = node_id
+        position[node_id] = hole
+
+class PQ_LazyHeap(PQInterface):
+    """
+    Lazy-deletion heap on the standard library's heapq, for up to capacity nodes with ids 0 to
+    capacity-1 (see PQInterface._id()). decrease_key() pushes a new (key, id, node) entry
+    instead of moving the old one, and delete_min() discards the stale entries it pops, so the
+    heap holds up to one entry per push rather than one per node.
+
+    It is sparse: only nodes with a finite key are ever in it, so computeShortestPaths() inserts
+    just the source, and decrease_key() of a node that isn't queued yet inserts it. pushes,
+    stale_pops and peak_size count the work done; stats() returns them.
+    """
+    sparse = True
+
+    def __init__(self, capacity):
+        self.queue = []
+        self.key = array('d', [math.inf]) * capacity # Current key of each node; -inf once deleted
+        self.capacity = capacity
+        self.live = 0 # Nodes queued and not yet deleted
+        self.pushes = 0
+        self.stale_pops = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        return self.live
+
+    def insert(self, item):
+        """
+        Time Complexity: O(log(pushes)) for the heappush.
+        Space Complexity: O(1) amortized, for the new entry.
+        """
+        self.decrease_key(item[2], item[0])
+
+    def decrease_key(self, node, new_key):
+        """
+        Time Complexity: O(log(pushes)), since the old entry is left in the heap.
+        Space Complexity: O(1) amortized, for the new entry.
+        """
+        if new_key == math.inf:
+            return
+        node_id = self._id(node)
+        if self.key[node_id] == math.inf:
+            self.live += 1
+        self.key[node_id] = new_key
+        heapq.heappush(self.queue, (new_key, node_id, node))
+        self.pushes += 1
+        if len(self.queue) > self.peak_size:
+            self.peak_size = len(self.queue)
+
+    def delete_min(self):
+        """
+        Time Complexity: O(log(pushes)) amortized; each stale entry is popped once.
+        Space Complexity: O(1)
+        """
+        key = self.key
+        while True:
+            item = heapq.heappop(self.queue)
+            if item[0] == key[item[1]]:
+                key[item[1]] = -math.inf
+                self.live -= 1
+                return item
+            self.stale_pops += 1
+
+    def make_queue(self, iterable):
+        """
+        Time Complexity: O(|V|log(|V|)) in general, but O(|V|) when only the source has a finite key.
+        Space Complexity: O(number of finite keys), since nodes at infinity are never pushed.
+        """
+        for triple in iterable:
+            self.insert(triple)
+
+    def stats(self):
+        return {'pushes': self.pushes, 'stale_pops': self.stale_pops, 'peak_size': self.peak_size}
+
+class PQ_DaryHeap(PQ_FlatHeap):
+    """
+    PQ_FlatHeap with d children per slot instead of two: the children of slot j are slots
+    d*j+1 to d*j+d. The heap is log_d(|V|) deep, so decrease_key() (a sift up) gets cheaper as
+    d grows, while delete_min() (a sift down) compares d children per level. Dijkstra does up
+    to |E| decrease_keys but only |V| delete_mins, which favours a d above two.
+    """
+    def __init__(self, capacity, d=4):
+        super().__init__(capacity)
+        assert( d >= 2 )
+        self.d = d
+
+    def _siftUp(self, hole, key, node_id):
+        """
+        Time Complexity: O(log_d(|V|))
+        Space Complexity: O(1)
+        """
+        keys, ids, position, d = self.keys, self.ids, self.position, self.d
+        while hole > 0:
+            parent = (hole - 1) // d
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            keys[hole] = parent_key
+            parent_id = ids[parent]
+            ids[hole] = parent_id
+            position[parent_id] = hole
+            hole = parent
+        keys[hole] = key
+        ids[hole] = node_id
+        position[node_id] = hole
+
+    def _siftDown(self, hole, key, node_id):
+        """
+        Time Complexity: O(d log_d(|V|))
+        Space Complexity: O(1)
+        """
+        keys, ids, position, d = self.keys, self.ids, self.position, self.d
+        size = self.size
+        first = d * hole + 1
+        while first < size:
+            child, child_key = first, keys[first]
+            for j in range(first + 1, min(first + d, size)):
+                if keys[j] < child_key:
+                    child, child_key = j, keys[j]
+            if key <= child_key:
+                break
+            keys[hole] = child_key
+            child_id = ids[child]
+            ids[hole] = child_id
+            position[child_id] = hole
+            hole = child
+            first = d * hole + 1
+        keys[hole] = key
+        ids[hole] = node_id
+        position[node_id] = hole
+
+class PQ_PairingHeap(PQInterface):
+    """
+    Pairing heap for up to capacity nodes with ids 0 to capacity-1 (see PQInterface._id()).
+    The tree is kept in arrays indexed by node id: child is a node's first child, sibling its
+    next sibling, and prev its previous sibling (or its parent, for a first child). insert()
+    and decrease_key() link a tree into the root in O(1), and delete_min() pairs up the root's
+    children left to right and then links the pairs right to left, which is O(log(|V|))
+    amortized.
+
+    Like PQ_LazyHeap it is sparse: computeShortestPaths() inserts just the source, and
+    decrease_key() of a node that isn't queued yet inserts it.
+    """
+    sparse = True
+
+    def __init__(self, capacity):
+        self.key = array('d', [math.inf]) * capacity
+        self.child = array(NODE_TYPECODE, [NO_NODE]) * capacity
+        self.sibling = array(NODE_TYPECODE, [NO_NODE]) * capacity
+        self.prev = array(NODE_TYPECODE, [NO_NODE]) * capacity
+        self.queued = bytearray(capacity) # 1 while a node is in the heap
+        self.capacity = capacity
+        self.root = NO_NODE
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _link(self, a, b):
+        """
+        Makes the root with the larger key the first child of the other, and returns the new root.
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        key, child, sibling, prev = self.key, self.child, self.sibling, self.prev
+        if key[b] < key[a]:
+            a, b = b, a
+        first = child[a]
+        sibling[b] = first
+        if first != NO_NODE:
+            prev[first] = b
+        prev[b] = a
+        child[a] = b
+        sibling[a] = prev[a] = NO_NODE
+        return a
+
+    def insert(self, item):
+        """
+        Time Complexity: O(1)
+        Space Complexity: O(1) since the arrays are preallocated.
+        """
+        node_id = self._id(item[2])
+        self.key[node_id] = item[0]
+        self.child[node_id] = self.sibling[node_id] = self.prev[node_id] = NO_NODE
+        self.queued[node_id] = 1
+        self.size += 1
+        self.root = node_id if self.root == NO_NODE else self._link(self.root, node_id)
+
+    def decrease_key(self, node, new_key):
+        """
+        Cuts the node's subtree out of its parent's child list and links it into the root.
+
+        Time Complexity: O(1) (O(log(log(|V|))) amortized or better, by the pairing heap analyses)
+        Space Complexity: O(1)
+        """
+        node_id = self._id(node)
+        if not self.queued[node_id]:
+            self.insert((new_key, node_id, node))
+            return
+        self.key[node_id] = new_key
+        if node_id == self.root:
+            return
+        child, sibling, prev = self.child, self.sibling, self.prev
+        before, after = prev[node_id], sibling[node_id]
+        if child[before] == node_id:
+            child[before] = after
+        else:
+            sibling[before] = after
+        if after != NO_NODE:
+            prev[after] = before
+        self.root = self._link(self.root, node_id)
+
+    def delete_min(self):
+        """
+        Time Complexity: O(log(|V|)) amortized
+        Space Complexity: O(log(|V|)) amortized, for the list of paired subtrees.
+        """
+        root = self.root
+        sibling, link = self.sibling, self._link
+        pairs = []
+        a = self.child[root]
+        while a != NO_NODE:
+            b = sibling[a]
+            if b == NO_NODE:
+                self.prev[a] = NO_NODE
+                pairs.append(a)
+                break
+            after = sibling[b]
+            pairs.append(link(a, b))
+            a = after
+        new_root = NO_NODE
+        for tree in reversed(pairs):
+            new_root = tree if new_root == NO_NODE else link(new_root, tree)
+        self.root = new_root
+        self.queued[root] = 0
+        self.size -= 1
+        return (self.key[root], root, self._node(root))
+
+    def make_queue(self, iterable):
+        """
+        Time Complexity: O(|V|), one O(1) insert per item.
+        Space Complexity: O(1) beyond the preallocated arrays.
+        """
+        for triple in iterable:
+            self.insert(triple)
+
+class PQ_Dial(PQInterface):
+    """
+    Bucket queue (Dial's algorithm) for nonnegative integer keys that are deleted in increasing
+    order, as Dijkstra's are, for up to capacity nodes with ids 0 to capacity-1 (see
+    PQInterface._id()). Bucket k mod m holds the nodes with key k. delete_min() scans forward
+    from the last key deleted to the next nonempty bucket. Every key in the queue is less than
+    m past that key, so no two keys share a bucket; m doubles when a key would break that. With
+    Dijkstra this holds once m exceeds the longest edge.
+
+    Like PQ_LazyHeap, decrease_key() appends the node to its new bucket and leaves the old entry
+    to be discarded as stale, and it is sparse: computeShortestPaths() inserts just the source.
+    Insert and decrease_key are O(1), and delete_min is O(1) amortized plus the scan, which
+    covers at most the largest distance in all. Only for integer_weights graphs.
+    """
+    sparse = True
+    integer_keys = True
+
+    def __init__(self, capacity):
+        self.buckets = [[] for _ in range(64)] # The bucket count m is kept a power of two
+        self.key = array('d', [math.inf]) * capacity # Current key of each node; -inf once deleted
+        self.capacity = capacity
+        self.current = 0 # The last key deleted, where the scan resumes
+        self.live = 0
+        self.pushes = 0
+        self.stale_pops = 0
+
+    def __len__(self):
+        return self.live
+
+    def insert(self, item):
+        """
+        Time Complexity: O(1) amortized
+        Space Complexity: O(1) amortized, for the bucket entry.
+        """
+        self.decrease_key(item[2], item[0])
+
+    def decrease_key(self, node, new_key):
+        """
+        Time Complexity: O(1) amortized; the old entry is left in its bucket.
+        Space Complexity: O(1) amortized, for the new entry.
+        """
+        if new_key == math.inf:
+            return
+        node_id = self._id(node)
+        new_key = int(new_key)
+        if self.key[node_id] == math.inf:
+            self.live += 1
+        self.key[node_id] = new_key
+        if new_key - self.current >= len(self.buckets):
+            self._grow(new_key - self.current + 1)
+        self.buckets[new_key & (len(self.buckets) - 1)].append(node_id)
+        self.pushes += 1
+
+    def delete_min(self):
+        """
+        Time Complexity: O(1) amortized, plus the buckets scanned on the way to the minimum.
+        Space Complexity: O(1)
+        """
+        key, buckets = self.key, self.buckets
+        mask = len(buckets) - 1
+        current = self.current
+        while True:
+            bucket = buckets[current & mask]
+            while bucket:
+                node_id = bucket.pop()
+                if key[node_id] == current:
+                    key[node_id] = -math.inf
+                    self.live -= 1
+                    self.current = current
+                    return (current, node_id, self._node(node_id))
+                self.stale_pops += 1
+            current += 1
+
+    def make_queue(self, iterable):
+        """
+        Time Complexity: O(|V|)
+        Space Complexity: O(number of finite keys), since nodes at infinity are never queued.
+        """
+        for triple in iterable:
+            self.insert(triple)
+
+    def _grow(self, span):
+        """
+        Rebuckets the queued nodes into at least span buckets, dropping stale entries.
+
+        Time Complexity: O(m + entries); m at least doubles each time, so this is amortized O(1)
+        Space Complexity: O(m)
+        """
+        m = len(self.buckets)
+        while m < span:
+            m *= 2
+        queued = {node_id for bucket in self.buckets for node_id in bucket if self.key[node_id] >= self.current}
+        self.buckets = [[] for _ in range(m)]
+        for node_id in queued:
+            self.buckets[int(self.key[node_id]) & (m - 1)].append(node_id)
+
+    def stats(self):
+        return {'pushes': self.pushes, 'stale_pops': self.stale_pops, 'buckets': len(self.buckets)}
+
 class PQ_Array(PQInterface):
-    def __init__(self):
+    def __init__(self, capacity=None):
         self.queue = []
-        self.node_to_index = {}
+        self.node_to_index = {} if capacity is None else [0] * capacity
 
     def insert(self, item):
         """
@@ -169,17 +671,44 @@ class PQ_Array(PQInterface):
             self.insert(triple)
 
 
+# Priority queues computeShortestPaths() can use on the indexed path, by name. Each is called
+# with the number of nodes.
+PRIORITY_QUEUES = {
+    'array': PQ_Array,
+    'heap': PQ_FlatHeap,
+    'recursive_heap': PQ_Heap,
+    'lazy_heap': PQ_LazyHeap,
+    'pairing_heap': PQ_PairingHeap,
+    'dial': PQ_Dial,
+    **{'{}-ary_heap'.format(d): functools.partial(PQ_DaryHeap, d=d) for d in range(2, 9)},
+}
+
+
 class NetworkRoutingSolver:
     def __init__( self):
         pass
 
-    def initializeNetwork( self, network ):
+    def initializeNetwork( self, network, indexed=True ):
+        """
+        With indexed (the default), dist and prev are flat arrays indexed by node_id, and the
+        priority queues work on node ids rather than node objects, so Dijkstra's inner loop reads
+        the graph's edge arrays directly and never hashes a node. Otherwise they are dicts keyed
+        by CS312GraphNode, as before.
+        """
         assert( type(network) == CS312Graph )
         self.network = network
-        self.dist = {node : math.inf for node in network.nodes}
-        self.prev = {node: None for node in network.nodes}
+        self.indexed = indexed
+        if indexed:
+            n = len(network.nodes)
+            self.dist = array('d', [math.inf]) * n
+            self.prev = array(NODE_TYPECODE, [NO_NODE]) * n
+        else:
+            self.dist = {node : math.inf for node in network.nodes}
+            self.prev = {node: None for node in network.nodes}
 
     def getShortestPath( self, destIndex ):
+        if self.indexed:
+            return self._getShortestPathIndexed(destIndex)
         path_edges = []
         total_length = 0
         cur_node = self.network.nodes[destIndex]
@@ -197,7 +726,25 @@ class NetworkRoutingSolver:
             cur_node = parent_node
         return {'cost':total_length, 'path':path_edges}
 
-    def computeShortestPaths( self, srcIndex, use_heap=False ):
+    def _getShortestPathIndexed( self, destIndex ):
+        graph = self.network
+        path_edges = []
+        total_length = 0
+        cur = destIndex
+        while self.prev[cur] != NO_NODE:
+            parent = self.prev[cur]
+            edge = next((k for k in range(graph.offsets[parent], graph.offsets[parent + 1]) if graph.dest[k] == cur), None)
+            if edge is None:
+                print('ERROR: could not find edge between {} and {}'.format(graph.nodes[parent], graph.nodes[cur]))
+                return
+
+            length = graph.length[edge]
+            path_edges.append( (graph.getLoc(parent), graph.getLoc(cur), '{:.0f}'.format(length)) )
+            total_length += length
+            cur = parent
+        return {'cost':total_length, 'path':path_edges}
+
+    def computeShortestPaths( self, srcIndex, use_heap=False, queue=None ):
         """ 
         The space complexity of this method depends on that of the graph.  If the graph is represented
         as an adjacency list, then the space complexity is O(|V| + |E|).  If the graph is represented
@@ -209,7 +756,19 @@ class NetworkRoutingSolver:
         complexities of the decrease_key and delete_min operations, respectively. Thus, if the priority queue
         is implemented as an array, the time complexity is O(|V|^2).  If the priority queue is
         implemented as a heap, the time complexity is O((|V| + |E|)log|V|).
+
+        On the indexed path, use_heap picks PQ_FlatHeap over PQ_Array, and queue can pick any
+        other priority queue, by its name in PRIORITY_QUEUES or as a PQInterface class, which is
+        constructed with the number of nodes and given node ids.
+        Afterwards self.queue_stats holds the queue's stats() (PQ_LazyHeap's counts), or None.
         """
+        if self.indexed:
+            if queue is None:
+                queue = PQ_FlatHeap if use_heap else PQ_Array
+            elif isinstance(queue, str):
+                queue = PRIORITY_QUEUES[queue]
+            return self._computeShortestPathsIndexed(srcIndex, queue)
+        assert( queue is None ) # The node-keyed path is kept as it was, with PQ_Heap or PQ_Array
 
         self.source = self.network.nodes[srcIndex]
         t1 = time.time()
@@ -236,5 +795,153 @@ class NetworkRoutingSolver:
                     self.prev[v] = u
                     H.decrease_key(v, self.dist[v]) # time complexity of decrease_key depends on the data structure used
 
+        self.queue_stats = H.stats() if hasattr(H, 'stats') else None
+        t2 = time.time()
+        return (t2-t1)
+
+    def _makeQueue( self, queue, n ):
+        """A queue(n) for a search on the network; integer-keyed queues need integer weights."""
+        H = queue(n)
+        if H.integer_keys and not self.network.integer_weights:
+            raise ValueError('{} needs a graph built with integer_weights'.format(type(H).__name__))
+        return H
+
+    def _computeShortestPathsIndexed( self, srcIndex, queue, target=NO_NODE ):
+        """
+        The same Dijkstra's algorithm on node ids: the queue holds (dist, id, id) triples, and
+        the out-edges of u are read straight from the graph's offsets/dest/length arrays instead
+        of building edge and node views. Same complexity as computeShortestPaths().
+
+        Stops once target (if given) is settled. self.search_stats counts the nodes settled
+        and the nodes touched (given a finite distance).
+        """
+        graph = self.network
+        self.source = graph.nodes[srcIndex]
+        t1 = time.time()
+
+        dist, prev = self.dist, self.prev
+        offsets, dest, length = graph.offsets, graph.dest, graph.length
+        dist[srcIndex] = 0
+        n = len(dist)
+        H = self._makeQueue(queue, n)
+        if H.sparse:
+            H.insert((0, srcIndex, srcIndex))
+        else:
+            H.make_queue([(dist[i], i, i) for i in range(n)])
+        settled = 0
+        while len(H) > 0:
+            u = H.delete_min()[2]
+            settled += 1
+            if u == target:
+                break
+            dist_u = dist[u]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = dest[k]
+                alt = dist_u + length[k]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    H.decrease_key(v, alt)
+
+        self.queue_stats = H.stats() if hasattr(H, 'stats') else None
+        self.search_stats = {'settled': settled, 'touched': n - dist.count(math.inf)}
         t2 = time.time()
         return (t2-t1)
+
+    def shortestPath( self, srcIndex, destIndex, queue='lazy_heap', bidirectional=False ):
+        """
+        Shortest path from srcIndex to destIndex alone, as getShortestPath() returns it (with
+        cost inf and no edges if destIndex can't be reached), plus 'settled' and 'touched' counts
+        of the nodes the search settled and gave a finite distance. Resets the search state, so
+        getShortestPath() afterwards is only valid for destIndex.
+
+        Dijkstra's algorithm stops as soon as destIndex is settled, instead of settling every
+        node as computeShortestPaths() does, so it touches only the nodes closer than destIndex
+        and their neighbours. A sparse queue (the default, PQ_LazyHeap, or PQ_PairingHeap or
+        PQ_Dial) keeps that saving; the others make_queue() every node first.
+
+        With bidirectional, searches run alternately forward from srcIndex and backward from
+        destIndex along the incoming edges (see CS312Graph.buildIncomingEdges()), and stop when
+        the distances last settled on the two sides add up to at least the shortest path found
+        through any edge between them. Each search covers about half the distance, so on graphs
+        like generateNetwork()'s far fewer nodes are touched. Counts are summed over both sides.
+
+        Time Complexity: that of computeShortestPaths() in the worst case (plus O(|V|) to reset
+        the arrays), and typically far less
+        Space Complexity: O(|V|)
+        """
+        if isinstance(queue, str):
+            queue = PRIORITY_QUEUES[queue]
+        self.initializeNetwork(self.network)
+        if srcIndex == destIndex or not bidirectional:
+            self._computeShortestPathsIndexed(srcIndex, queue, target=destIndex)
+            stats = dict(self.search_stats)
+        else:
+            stats = self._bidirectionalSearch(srcIndex, destIndex, queue)
+        path = self._getShortestPathIndexed(destIndex)
+        if self.prev[destIndex] == NO_NODE and srcIndex != destIndex:
+            path['cost'] = math.inf
+        path.update(stats)
+        return path
+
+    def _bidirectionalSearch( self, srcIndex, destIndex, queue ):
+        """
+        Runs the two searches for shortestPath() and leaves the path in self.prev, so that
+        _getShortestPathIndexed(destIndex) can walk it back. Returns the settled/touched counts.
+        """
+        graph = self.network
+        graph.buildIncomingEdges()
+        n = len(self.dist)
+        # Forward search state, in self.dist/self.prev, and backward (next node towards destIndex)
+        dist, prev = self.dist, self.prev
+        dist_back = array('d', [math.inf]) * n
+        next_node = array(NODE_TYPECODE, [NO_NODE]) * n
+        sides = [(dist, prev, dist_back, graph.offsets, graph.dest, graph.length, self._makeQueue(queue, n)),
+                 (dist_back, next_node, dist, graph.in_offsets, graph.in_src, graph.in_length, self._makeQueue(queue, n))]
+        last_settled = [0, 0] # Distance last settled on each side
+        best, meet = math.inf, None # Shortest path found so far, through edge meet = (u, v)
+        settled = 0
+        for side, start in enumerate((srcIndex, destIndex)):
+            sides[side][0][start] = 0
+            H = sides[side][6]
+            if H.sparse:
+                H.insert((0, start, start))
+            else:
+                H.make_queue([(sides[side][0][i], i, i) for i in range(n)])
+        side = 0
+        while len(sides[0][6]) > 0 and len(sides[1][6]) > 0 and last_settled[0] + last_settled[1] < best:
+            here, link, there, offsets, ends, length, H = sides[side]
+            u = H.delete_min()[2]
+            settled += 1
+            dist_u = here[u]
+            last_settled[side] = dist_u
+            for k in range(offsets[u], offsets[u + 1]):
+                v = ends[k]
+                alt = dist_u + length[k]
+                if alt < here[v]:
+                    here[v] = alt
+                    link[v] = u
+                    H.decrease_key(v, alt)
+                if alt + there[v] < best:
+                    best = alt + there[v]
+                    meet = (u, v) if side == 0 else (v, u)
+            side = 1 - side
+
+        if meet is not None:
+            # The forward prev already leads from meet[0] back to srcIndex; extend it along the
+            # meeting edge and the backward search's links on to destIndex. With zero-length
+            # edges the two halves can share nodes, so the path switches over at the last node
+            # of the backward half that is also on the forward half, to keep prev acyclic.
+            u, v = meet
+            forward = {u}
+            while prev[u] != NO_NODE:
+                u = prev[u]
+                forward.add(u)
+            backward = [meet[0], meet[1]]
+            while backward[-1] != destIndex:
+                backward.append(next_node[backward[-1]])
+            switch = max(i for i, node in enumerate(backward) if node in forward)
+            for i in range(switch + 1, len(backward)):
+                prev[backward[i]] = backward[i - 1]
+        touched = 2 * n - dist.count(math.inf) - dist_back.count(math.inf)
+        return {'settled': settled, 'touched': touched}
@@ -280,13 +280,13 @@ class Proj3GUI( QMainWindow ):
 		else:
 			doArray = True
 			doHeap = True
+		src  = int(self.sourceNode.text())-1
+		dest = int(self.targetNode.text())-1
 		if doArray:
-			array_time = self.solver.computeShortestPaths( int(self.sourceNode.text())-1, use_heap=False )
-			array_path = self.solver.getShortestPath( int(self.targetNode.text())-1 )
+			array_path, array_time = self.timeShortestPath( src, dest, 'array' )
 			dist = array_path['cost']
 		if doHeap:
-			heap_time = self.solver.computeShortestPaths( int(self.sourceNode.text())-1, use_heap=True )
-			heap_path = self.solver.getShortestPath( int(self.targetNode.text())-1 )
+			heap_path, heap_time = self.timeShortestPath( src, dest, 'heap' )
 			dist = heap_path['cost']
 		self.display_paths( heap_path, heap_time, array_path, array_time )
 		self.checkPathInputs()
@@ -297,6 +297,13 @@ class Proj3GUI( QMainWindow ):
 		self.view.clicknode = 'start'
 		self.repaint()
 
+	def timeShortestPath(self, src, dest, queue):
+		# Only the path to dest is shown, so the search stops once dest is settled
+		t1 = time.time()
+		path = self.solver.shortestPath( src, dest, queue=queue )
+		t2 = time.time()
+		return path, t2-t1
+
 	def checkGenInputs(self):
 		seed  = self.randSeed.text()
 		size = self.size.text()
@@ -1,126 +1,176 @@
 """networkRoutingBenchmarker.py: Benchmarking the network routing algorithms."""
 
-import time
 import random
 import math
 
-from PyQt6.QtCore import QPointF
+import numpy as np
 
 import NetworkRoutingSolver as networkRoutingSolver
 from CS312Graph import CS312Graph
+from benchmark import Benchmark
+from point_generators import QPointFSequence, uniform_rectangle
 
 
 nValuesToTestArray = [100, 1000, 10000, 100000]
 nValuesToTestHeap = [100, 1000, 10000, 100000, 1000000]
+nValuesToTestNodeDicts = [100000, 1000000] # The heap on node-keyed dicts, to compare with the indexed heap
+nValuesToTestRecursiveHeap = [100000, 1000000] # The recursive, tuple-based PQ_Heap, to compare with PQ_FlatHeap
+nValuesToTestPointToPoint = [100000, 1000000]
+numPointToPointQueries = 10
 
 
 def newPoints(numPoints):
-    """Generate a list of random points in the range specified by the user."""
+    """Generate a QPointFSequence of uniform random points in [-2, 2] x [-1, 1]."""
     seed = 0
-    random.seed(seed)
-    ptList = []
-    xr = [-2.0, 2.0]
-    yr = [-1.0, 1.0]
-    while len(ptList) < numPoints:
-        x = random.uniform(0.0, 1.0)
-        y = random.uniform(0.0, 1.0)
-        if True:
-            xVal = xr[0] + (xr[1] - xr[0]) * x
-            yVal = yr[0] + (yr[1] - yr[0]) * y
-            ptList.append(QPointF(xVal, yVal))
-    return ptList
-
-
-def generateNetwork(numPoints):
-    """Generate a random network with numPoints nodes."""
+    random.seed(seed) # generateNetwork() still draws the edges from random
+    rng = np.random.default_rng(seed)
+    return QPointFSequence(uniform_rectangle(numPoints, rng, (-2.0, 2.0), (-1.0, 1.0)))
+
+
+def generateNetwork(numPoints, integer_weights=False):
+    """Generate a random network with numPoints nodes, with integer edge lengths if integer_weights."""
     nodes = newPoints(numPoints)
+    coords = nodes.tolist() # Edge lengths come straight from the coordinates, not QPointF
     OUT_DEGREE = 3
     size = len(nodes)
     edgeList = {}
     for u in range(size):
         edgeList[u] = []
-        pt_u = nodes[u]
+        x_u, y_u = coords[u]
         chosen = []
         for i in range(OUT_DEGREE):
             v = random.randint(0, size - 1)
             while v in chosen or v == u:
                 v = random.randint(0, size - 1)
             chosen.append(v)
-            pt_v = nodes[v]
-            uv_len = math.sqrt((pt_v.x() - pt_u.x()) ** 2 +
-                               (pt_v.y() - pt_u.y()) ** 2)
+            x_v, y_v = coords[v]
+            uv_len = math.sqrt((x_v - x_u) ** 2 +
+                               (y_v - y_u) ** 2)
             edgeList[u].append((v, 100.0 * uv_len))
         edgeList[u] = sorted(edgeList[u], key=lambda n: n[0])
-    graph = CS312Graph(nodes, edgeList)
+    graph = CS312Graph(nodes, edgeList, integer_weights)
     return graph
 
 
-if __name__ == "__main__":
-    testResultsArray = {nValue: [] for nValue in nValuesToTestArray}
-    testResultsHeap = {nValue: [] for nValue in nValuesToTestHeap}
-
-    print("Testing with array implementation")
-    for nValue in nValuesToTestArray:
-        print(f"Testing with n = {nValue}")
-        for i in range(5):
-            print(f"Generating network with {nValue} nodes...")
-            graph = generateNetwork(nValue)
-            solver = networkRoutingSolver.NetworkRoutingSolver()
-            solver.initializeNetwork(graph)
-            print(f" Test {i + 1}")
-            t1 = time.time()
-            solver.computeShortestPaths(0, use_heap=False)
-            t2 = time.time()
+def checkIntegerWeights(graph, srcIndex=0):
+    """
+    Correctness check for the integer-keyed queues: runs Dijkstra's algorithm on an
+    integer_weights graph with PQ_Dial and with the binary heap, and returns the number of nodes
+    whose distances differ. The distances are sums of integers, so they should match exactly.
+    """
+    distances = []
+    for queue in ("dial", "heap"):
+        solver = networkRoutingSolver.NetworkRoutingSolver()
+        solver.initializeNetwork(graph)
+        solver.computeShortestPaths(srcIndex, queue=queue)
+        distances.append(solver.dist)
+    return sum(1 for a, b in zip(*distances) if a != b)
+
+
+def pointToPointQueries(solver, pairs, method):
+    """
+    Answers each (src, dst) query in pairs by method: "full" runs computeShortestPaths() from
+    src and reads off the path to dst, and "early_exit" and "bidirectional" call shortestPath().
+    Returns a list of the results, each with its cost, path and settled/touched counts.
+    """
+    results = []
+    for src, dst in pairs:
+        if method == "full":
+            solver.initializeNetwork(solver.network)
+            solver.computeShortestPaths(src, queue="lazy_heap")
+            result = solver.getShortestPath(dst)
+            result["cost"] = solver.dist[dst]
+            result.update(solver.search_stats)
+        else:
+            result = solver.shortestPath(src, dst, bidirectional=method == "bidirectional")
+        results.append(result)
+    return results
 
-            elapsedTime = t2 - t1
-            print(f"  Elapsed time: {elapsedTime:3.3f} seconds")
-            testResultsArray[nValue].append(elapsedTime)
 
-    print("Testing with heap implementation")
-    for nValue in nValuesToTestHeap:
-        print(f"Testing with n = {nValue}")
-        for i in range(5):
-            print(f"Generating network with {nValue} nodes...")
-            graph = generateNetwork(nValue)
+if __name__ == "__main__":
+    # newPoints() seeds with 0 and generateNetwork() carries on from there, so every run
+    # times the same networks
+    bench = Benchmark("network_routing", seed=0)
+    graphs = {}
+
+    # (label, sizes, queue, integer_weights): queue names the priority queue in PRIORITY_QUEUES,
+    # or is None for PQ_Heap on the node-keyed dicts. dial needs integer weights, so it is
+    # compared with the heap on the same integer-weight graphs.
+    series = [("array", nValuesToTestArray, "array", False),
+              ("recursive_heap", nValuesToTestRecursiveHeap, "recursive_heap", False),
+              ("heap_node_dicts", nValuesToTestNodeDicts, None, False)]
+    series += [(name, nValuesToTestHeap, name, False) for name in networkRoutingSolver.PRIORITY_QUEUES
+               if name not in ("array", "recursive_heap", "dial")]
+    series += [("dial", nValuesToTestHeap, "dial", True),
+               ("heap_integer_weights", nValuesToTestHeap, "heap", True)]
+
+    for label, nValues, queue, integer_weights in series:
+        print(f"Testing with {label} implementation")
+        for nValue in nValues:
+            print(f"Testing with n = {nValue}")
+            if (nValue, integer_weights) not in graphs:
+                print(f"Generating network with {nValue} nodes...")
+                graphs[(nValue, integer_weights)] = generateNetwork(nValue, integer_weights)
+            graph = graphs[(nValue, integer_weights)]
             solver = networkRoutingSolver.NetworkRoutingSolver()
-            solver.initializeNetwork(graph)
-            print(f" Test {i + 1}")
-            t1 = time.time()
-            solver.computeShortestPaths(0, use_heap=True)
-            t2 = time.time()
-
-            elapsedTime = t2 - t1
-            print(f"  Elapsed time: {elapsedTime:3.3f} seconds")
-            testResultsHeap[nValue].append(elapsedTime)
-
-    finalResults = {}
-    for nValue, results in testResultsArray.items():
-        finalResults[nValue] = sum(results) / len(results)
-
-    finalResultsHeap = {}
-    for nValue, results in testResultsHeap.items():
-        finalResultsHeap[nValue] = sum(results) / len(results)
-
-    # Write test results to a file
-    with open("network_routing_benchmark_results.txt", "w") as f:
-        f.write("Array implementation\n")
-        for nValue, results in testResultsArray.items():
-            f.write(f"{nValue}\n")
-            for result in results:
-                f.write(f"{result:3.3f}\n")
-            f.write("\n")
-
-        f.write("\nAverages (seconds)\n")
-        for nValue in nValuesToTestArray:
-            f.write(f"{nValue} {finalResults[nValue]:3.3f} seconds\n")
-
-        f.write("\n\nHeap implementation\n")
-        for nValue, results in testResultsHeap.items():
-            f.write(f"{nValue}\n")
-            for result in results:
-                f.write(f"{result:3.3f}\n")
-            f.write("\n")
-
-        f.write("\nAverages (seconds)\n")
-        for nValue in nValuesToTestHeap:
-            f.write(f"{nValue} {finalResultsHeap[nValue]:3.3f} seconds\n")
+            # The array version is O(|V|^2), so at the largest sizes a warmup run costs minutes
+            bench.time(label, nValue, solver.computeShortestPaths, 0, True, queue,
+                       warmup=0 if label == "array" and nValue >= 10000 else None,
+                       setup=lambda: solver.initializeNetwork(graph, queue is not None))
+            if solver.queue_stats is not None:
+                bench.annotate(**solver.queue_stats)
+            row = bench.rows[-1]
+            print(f"  Median time: {row['median']:3.3f} seconds (p95 {row['p95']:3.3f}, stddev {row['stddev']:3.3f})")
+            if solver.queue_stats is not None:
+                print("  " + ", ".join(f"{key} {value}" for key, value in solver.queue_stats.items()))
+            if label == "dial":
+                mismatches = checkIntegerWeights(graph)
+                bench.annotate(mismatches=mismatches)
+                print(f"  {'OK' if mismatches == 0 else 'MISMATCH'}: {mismatches} distances differ from the heap's")
+
+    for label, model in [("array", "n^2"), ("heap", "nlogn")]:
+        c, error = bench.fit(label, model)
+        print(f"{label}: {c:.3e} s x {model} (relative RMS error {error:.3f})")
+
+    # Speedup of the first of each pair over the second, at every n both were timed at
+    medians = {(row['label'], row['n']): row['median'] for row in bench.rows}
+    for fast, slow in [("heap", "recursive_heap"), ("heap", "heap_node_dicts"),
+                       ("lazy_heap", "recursive_heap"), ("lazy_heap", "array"), ("lazy_heap", "heap"),
+                       ("dial", "heap_integer_weights")]:
+        for nValue in sorted(n for label, n in medians if label == fast and (slow, n) in medians):
+            speedup = medians[(slow, nValue)] / medians[(fast, nValue)]
+            print(f"n = {nValue}: {fast} is {speedup:.2f}x as fast as {slow}")
+
+    # The queue matrix: every queue's median at each size, fastest first (dial's on the
+    # integer-weight graphs)
+    for nValue in nValuesToTestHeap:
+        timed = sorted((medians[(name, nValue)], name) for name in networkRoutingSolver.PRIORITY_QUEUES
+                       if (name, nValue) in medians)
+        print(f"n = {nValue}: " + ", ".join(f"{name} {median:.4f}s" for median, name in timed))
+
+    # Point-to-point queries between random pairs of nodes, timed for the whole batch
+    for nValue in nValuesToTestPointToPoint:
+        if (nValue, False) not in graphs:
+            graphs[(nValue, False)] = generateNetwork(nValue)
+        graph = graphs[(nValue, False)]
+        graph.buildIncomingEdges()
+        solver = networkRoutingSolver.NetworkRoutingSolver()
+        solver.initializeNetwork(graph)
+        rng = random.Random(nValue)
+        pairs = [(rng.randrange(nValue), rng.randrange(nValue)) for _ in range(numPointToPointQueries)]
+        costs = {}
+        for method in ("full", "early_exit", "bidirectional"):
+            results = bench.time("p2p_" + method, nValue, pointToPointQueries, solver, pairs, method,
+                                 warmup=0, repeat=3)
+            costs[method] = [result["cost"] for result in results]
+            touched = sum(result["touched"] for result in results) / len(results) / nValue
+            settled = sum(result["settled"] for result in results) / len(results) / nValue
+            bench.annotate(queries=len(pairs), touched_fraction=touched, settled_fraction=settled)
+            print(f"n = {nValue}: p2p_{method} {bench.rows[-1]['median'] / len(pairs):.4f}s per query, "
+                  f"touching {100 * touched:.2f}% and settling {100 * settled:.2f}% of the nodes")
+        for method in ("early_exit", "bidirectional"):
+            agree = all(a == b or math.isclose(a, b) for a, b in zip(costs["full"], costs[method]))
+            print(f"  {'OK' if agree else 'MISMATCH'}: p2p_{method} costs {'match' if agree else 'differ from'} the full search's")
+
+    bench.write_json("network_routing_benchmark_results.json")
+    bench.write_csv("network_routing_benchmark_results.csv")
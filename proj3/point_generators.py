@@ -0,0 +1,58 @@
+"""point_generators.py: Vectorized random node locations for the network routing benchmarks.
+
+uniform_rectangle() draws the points in bulk from a seeded np.random.Generator as an (n, 2)
+float array, rather than one random.uniform() call at a time. QPointFSequence presents such an
+array as a sequence of QPointF without building all the QPointF objects up front.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def uniform_rectangle(n, rng, x_range=(-1.0, 1.0), y_range=(-1.0, 1.0)):
+    """Uniform in the rectangle x_range x y_range; the default is the square [-1, 1]^2."""
+    return np.column_stack((rng.uniform(x_range[0], x_range[1], n), rng.uniform(y_range[0], y_range[1], n)))
+
+
+def _qpointf():
+    # Imported on first use, so uniform_rectangle() works without PyQt installed
+    from which_pyqt import PYQT_VER
+    if PYQT_VER == 'PYQT5':
+        from PyQt5.QtCore import QPointF
+    elif PYQT_VER == 'PYQT4':
+        from PyQt4.QtCore import QPointF
+    elif PYQT_VER == 'PYQT6':
+        from PyQt6.QtCore import QPointF
+    else:
+        raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+    return QPointF
+
+
+class QPointFSequence(Sequence):
+    """
+    Read-only sequence of QPointF over an (n, 2) array, creating each QPointF when it is
+    accessed. tolist() returns the (x, y) pairs themselves, so generateNetwork() can compute
+    edge lengths without going through QPointF, and CS312Graph reads the array directly.
+    """
+
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=float).reshape(-1, 2)
+        self._QPointF = _qpointf()
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QPointFSequence(self.array[index])
+        x, y = self.array[index]
+        return self._QPointF(float(x), float(y))
+
+    def __iter__(self):
+        QPointF = self._QPointF
+        for x, y in self.array.tolist():
+            yield QPointF(x, y)
+
+    def tolist(self):
+        return self.array.tolist()